@@ -14,10 +14,88 @@ class Settings(BaseSettings):
     supabase_service_key: str | None = None
     supabase_jwt_secret: str | None = None
     supabase_storage_bucket: str = "generated-pages"
+    # Private bucket for uploaded CSVs; only the service key can read them back.
+    supabase_upload_bucket: str = "bulk-uploads"
+
+    # "supabase", "local" (directory tree) or "memory" (in-process fake).
+    storage_backend: str = "supabase"
+    local_storage_path: str = "./storage"
+    local_storage_base_url: str | None = None
+    local_upload_path: str = "./uploads"
+    fake_storage_latency: float = 0.0
+    fake_storage_failure_rate: float = 0.0
 
     redis_url: str = "redis://localhost:6379"
     allowed_origins: str = "http://localhost:3000"
-    
+
+    template_cache_size: int = 256
+
+    # Slug -> page lookups served from memory; misses are cached for less time
+    # since pages created by other processes can't invalidate them.
+    slug_cache_size: int = 10_000
+    slug_cache_ttl: float = 60.0
+    slug_cache_miss_ttl: float = 5.0
+
+    # Per-user dashboard stats are recomputed at most this often (seconds).
+    job_stats_cache_size: int = 10_000
+    job_stats_cache_ttl: float = 5.0
+
+    # Uploads are validated column-wise up to this many rows; render errors are checked on a sample.
+    csv_validation_max_rows: int = 200_000
+    csv_validation_render_sample: int = 200
+
+    # Bulk jobs with more rows than this are split into shards run by separate workers.
+    bulk_shard_size: int = 2000
+    bulk_shard_timeout: int = 600
+    bulk_shard_result_ttl: int = 86400
+    bulk_shard_retries: int = 2
+    # Parent jobs of sharded runs only split the CSV; their timeout allows this rate.
+    bulk_split_rows_per_second: int = 1000
+    # Titles/slugs claimed by running bulk workers are shared through Redis for
+    # this long after a user's last claim, so concurrent shards never hand out
+    # the same one. Must exceed the longest bulk job.
+    bulk_claim_ttl: int = 6 * 3600
+
+    # Jobs are routed to the interactive, small or large queue lane by row count.
+    queue_interactive_max_rows: int = 10
+    queue_small_max_rows: int = 2000
+    # Small/large jobs and shards one tenant may run at once; 0 disables the cap.
+    bulk_tenant_max_running: int = 4
+    bulk_tenant_defer_seconds: int = 5
+
+    # "fork" runs every job in a forked child (RQ's default); "warm" keeps
+    # long-lived worker processes whose caches and connections outlive a job.
+    worker_mode: str = "fork"
+    worker_processes: int = 1
+    # Warm workers are replaced after this many jobs or past this RSS; 0 disables either.
+    worker_max_jobs: int = 500
+    worker_max_rss_mb: int = 1024
+
+    # Live row counters are kept in Redis; the BulkJob row is written at most this often (seconds).
+    progress_flush_interval: float = 5.0
+    # Minimum seconds between progress events published for SSE streams.
+    progress_publish_interval: float = 0.5
+
+    # Pages per multi-row INSERT in bulk jobs.
+    page_insert_batch_size: int = 100
+
+    # Worker processes rendering rows of a bulk job; 1 renders inline.
+    render_processes: int = 1
+    render_chunk_size: int = 50
+
+    # Bulk ZIPs spill to disk past spool size; a non-zero part size splits them into parts.
+    bulk_zip_spool_size: int = 8 * 1024 * 1024
+    bulk_zip_part_size: int = 0
+
+    upload_max_in_flight: int = 8
+    upload_max_retries: int = 3
+    upload_retry_backoff: float = 0.5
+
+    # Verified tokens are cached until their exp, capped at max TTL (seconds) -
+    # which also bounds how long a session revoked upstream keeps working.
+    auth_cache_size: int = 10_000
+    auth_cache_max_ttl: int = 300
+
     secret_key: str = "dev-secret-key-change-in-production"
     algorithm: str = "HS256"
 
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from jose import jwt, JWTError
 from datetime import datetime, timezone
 from typing import Generator
+import hmac
 
 from supabase import create_client, Client
 
 from app.config import settings
 from app.models import Base
+from app.services.page_search import install_search_index
+from app.services.token_cache import count, token_cache, token_key, token_ttl
 
 
 # Database
@@ -28,6 +32,7 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
+    install_search_index(engine)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -68,36 +73,68 @@ async def get_current_user(
 ) -> dict:
     token = credentials.credentials
 
+    # Every request of a session carries the same token; verify it once.
+    key = token_key(token)
+    found, user = token_cache.get(key)
+    if found:
+        return user
+
     # Try local JWT verification if secret is provided
     payload = verify_supabase_jwt(token)
     if payload and payload.get("sub"):
-        return {
+        count("local_verifications")
+        user = {
             "id": payload.get("sub"),
             "email": payload.get("email") or "",
             "role": payload.get("role") or "authenticated",
         }
+        token_cache.set(key, user, token_ttl(token, payload))
+        return user
 
     # Fallback to Supabase Auth API
     if supabase:
+        count("remote_verifications")
         try:
-            auth_response = supabase.auth.get_user(token)
+            # A network round-trip; keep it off the event loop.
+            auth_response = await run_in_threadpool(supabase.auth.get_user, token)
             user = auth_response.user
-            return {
+            user = {
                 "id": user.id,
                 "email": user.email or "",
                 "role": "authenticated",
             }
         except Exception as exc:
+            count("rejected")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Invalid or expired token: {str(exc)}",
             )
+        token_cache.set(key, user, token_ttl(token))
+        return user
 
+    count("rejected")
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Authentication failed",
     )
 
 
+def require_service_role(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict:
+    """Allow only the Supabase service key or another ``service_role`` JWT; for internal endpoints."""
+    token = credentials.credentials
+    service_key = settings.supabase_service_key
+    if service_key and hmac.compare_digest(token.encode("utf-8"), service_key.encode("utf-8")):
+        return {"role": "service_role"}
+    payload = verify_supabase_jwt(token)
+    if payload and payload.get("role") == "service_role":
+        return payload
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Service role required",
+    )
+
+
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
@@ -41,7 +41,10 @@ class Template(Base):
     pages = relationship("Page", back_populates="template")
     bulk_jobs = relationship("BulkJob", back_populates="template")
 
-    __table_args__ = (Index("idx_templates_user_id", "user_id"),)
+    __table_args__ = (
+        Index("idx_templates_user_id", "user_id"),
+        Index("idx_templates_user_created", "user_id", "created_at", "id"),
+    )
 
 
 class TemplateVariable(Base):
@@ -72,6 +75,11 @@ class Page(Base):
     slug = Column(String(255), nullable=False, index=True)
     html_content = Column(Text, nullable=False)
     storage_url = Column(String(500), nullable=False)
+    # Body text for full-text search (see services.page_search).
+    search_text = Column(Text)
+    # Inputs and output hash of the render, for regenerating after a template edit.
+    variables = Column(JSON)
+    render_hash = Column(String(64))
     word_count = Column(Integer, default=0)
     seo_score = Column(Integer, default=0)
     seo_data = Column(JSON, default=dict)
@@ -84,7 +92,9 @@ class Page(Base):
 
     __table_args__ = (
         Index("idx_pages_user_id", "user_id"),
+        Index("idx_pages_user_created", "user_id", "created_at", "id"),
         Index("idx_pages_slug", "slug"),
+        Index("idx_pages_template_id", "template_id", "id"),
         UniqueConstraint("user_id", "slug", name="uq_user_slug"),
     )
 
@@ -95,13 +105,16 @@ class BulkJob(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, nullable=False, index=True)
     template_id = Column(String, ForeignKey("templates.id"))
+    # "generate" (CSV upload) or "regenerate" (re-render a template's pages).
+    kind = Column(String(20), nullable=False, default="generate")
     csv_filename = Column(String(255))
     total_rows = Column(Integer, default=0)
     processed_rows = Column(Integer, default=0)
     failed_rows = Column(Integer, default=0)
     status = Column(String(50), default="queued")
-    result_urls = Column(JSON, default=list)
-    errors = Column(JSON, default=list)
+    zip_url = Column(String(500))
+    zip_parts = Column(JSON)
+    error = Column(Text)
     created_at = Column(DateTime, default=utcnow)
     updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
@@ -109,5 +122,28 @@ class BulkJob(Base):
 
     __table_args__ = (
         Index("idx_bulk_jobs_user_id", "user_id"),
+        Index("idx_bulk_jobs_user_created", "user_id", "created_at", "id"),
         Index("idx_bulk_jobs_status", "status"),
     )
+
+
+class BulkJobResult(Base):
+    __tablename__ = "bulk_job_results"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_id = Column(String, ForeignKey("bulk_jobs.id", ondelete="CASCADE"), nullable=False)
+    row_number = Column(Integer, nullable=False)
+    status = Column(String(50), nullable=False)
+    page_id = Column(String)
+    url = Column(String(500))
+    title = Column(String(255))
+    slug = Column(String(255))
+    seo_score = Column(Integer)
+    error = Column(Text)
+    data = Column(JSON)
+    created_at = Column(DateTime, default=utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("job_id", "row_number", name="uq_bulk_job_result_row"),
+        Index("idx_bulk_job_results_job_status_row", "job_id", "status", "row_number"),
+    )
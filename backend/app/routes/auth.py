@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends
 
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, require_service_role
 from app.schemas import UserResponse
+from app.services.token_cache import auth_stats
 
 router = APIRouter()
 
@@ -9,3 +10,12 @@ router = APIRouter()
 @router.get("/me", response_model=UserResponse)
 async def me(current_user: dict = Depends(get_current_user)):
     return UserResponse(id=current_user["id"], email=current_user["email"])
+
+
+@router.get("/cache")
+async def auth_cache(service: dict = Depends(require_service_role)):
+    """Token cache size, hits and misses, and how many tokens were verified locally or remotely.
+
+    Process-wide numbers, so only the service role may read them.
+    """
+    return auth_stats()
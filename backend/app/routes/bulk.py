@@ -1,25 +1,112 @@
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import csv
-import io
+from typing import Optional
 import os
 
 from rq import Queue, Retry
 from redis import Redis
 
 from app.config import settings
-from app.dependencies import get_db, get_current_user
-from app.models import Template, BulkJob
-from app.schemas import BulkJobResponse, BulkJobListResponse
+from app.dependencies import get_db, get_current_user, supabase
+from app.models import Template, BulkJob, BulkJobResult
+from app.schemas import (
+    BulkJobResponse,
+    BulkJobListPage,
+    BulkJobResultPage,
+    BulkJobErrorPage,
+    BulkPreviewResponse,
+    CsvValidationReport,
+)
+from app.services.bulk_preview import build_preview
+from app.services.csv_service import ingest_csv, store_csv
+from app.services.csv_validation import validate_csv
+from app.services.job_progress import FINAL_STATUSES, get_progress_redis, progress_hub, read_progress
+from app.services.job_queue import bulk_job_timeout, enqueue_meta, get_lane_queue, lane_for
+from app.services.job_stats import invalidate_stats
+from app.services.pagination import keyset_page
+from app.services.storage_service import upload_storage
 
 router = APIRouter()
 logger = logging.getLogger("app.bulk")
 
+EVENTS_KEEPALIVE = 15
 
-def get_queue() -> Queue:
+
+def get_queue(lane: str) -> Queue:
     redis_conn = Redis.from_url(settings.redis_url)
-    return Queue("bulk", connection=redis_conn)
+    return get_lane_queue(lane, redis_conn)
+
+
+def _ingest_upload(db: Session, template_id: str, file: UploadFile, user_id: str):
+    template = (
+        db.query(Template)
+        .filter(Template.id == template_id, Template.user_id == user_id)
+        .first()
+    )
+    if not template:
+        logger.warning("bulk_template_not_found user=%s template_id=%s", user_id, template_id)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+
+    # Check headers and count in one streaming pass over the spooled upload.
+    try:
+        csv_file, total_rows = ingest_csv(file.file, template.variables or [])
+    except ValueError as exc:
+        logger.warning("bulk_csv_rejected user=%s error=%s", user_id, str(exc))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return template, csv_file, total_rows
+
+
+def _validate_upload(csv_file, template: Template, total_rows: int, user_id: str) -> dict:
+    report = validate_csv(csv_file, template, total_rows)
+    logger.info(
+        "bulk_csv_validated user=%s rows=%s issues=%s valid=%s elapsed_ms=%s",
+        user_id,
+        report["checked_rows"],
+        len(report["issues"]),
+        report["valid"],
+        report["elapsed_ms"],
+    )
+    return report
+
+
+@router.post("/validate", response_model=CsvValidationReport)
+def validate_bulk_csv(
+    template_id: str,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Validate-only mode of ``create_bulk_job``: reports problems, stores and enqueues nothing."""
+    template, csv_file, total_rows = _ingest_upload(db, template_id, file, current_user["id"])
+    with csv_file:
+        return _validate_upload(csv_file, template, total_rows, current_user["id"])
+
+
+@router.post("/preview", response_model=BulkPreviewResponse)
+def preview_bulk_job(
+    template_id: str,
+    sample: int = Query(5, ge=1, le=50),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Dry run of ``create_bulk_job``: renders ``sample`` rows; nothing is stored, uploaded or enqueued."""
+    template, csv_file, total_rows = _ingest_upload(db, template_id, file, current_user["id"])
+    with csv_file:
+        validation = _validate_upload(csv_file, template, total_rows, current_user["id"])
+        preview = build_preview(csv_file, template, total_rows, sample)
+    logger.info(
+        "bulk_preview user=%s rows=%s sampled=%s estimate_seconds=%s",
+        current_user["id"],
+        total_rows,
+        preview["sampled_rows"],
+        preview["estimate"]["seconds"],
+    )
+    return {**preview, "validation": validation}
 
 
 @router.post("/", response_model=BulkJobResponse)
@@ -30,47 +117,28 @@ def create_bulk_job(
     current_user: dict = Depends(get_current_user),
 ):
     logger.info("bulk_job_start user=%s template_id=%s filename=%s", current_user["id"], template_id, file.filename)
-    template = (
-        db.query(Template)
-        .filter(Template.id == template_id, Template.user_id == current_user["id"])
-        .first()
-    )
-    if not template:
-        logger.warning("bulk_template_not_found user=%s template_id=%s", current_user["id"], template_id)
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
-
-    content = file.file.read().decode("utf-8")
-    reader = csv.DictReader(io.StringIO(content))
-    rows = list(reader)
-
-    if not rows:
-        logger.warning("bulk_empty_csv user=%s", current_user["id"])
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV has no rows")
-
-    required_vars = set(template.variables or [])
-    header_vars = set(reader.fieldnames or [])
-    missing = required_vars - header_vars
-    if missing:
-        logger.warning("bulk_missing_columns user=%s missing=%s", current_user["id"], ",".join(sorted(missing)))
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"CSV missing required columns: {', '.join(sorted(missing))}",
-        )
+    template, csv_file, total_rows = _ingest_upload(db, template_id, file, current_user["id"])
+    # The worker streams rows back from storage and only the key is enqueued.
+    with csv_file:
+        validation = _validate_upload(csv_file, template, total_rows, current_user["id"])
+        csv_key = store_csv(upload_storage(supabase), current_user["id"], csv_file)
 
     job = BulkJob(
         user_id=current_user["id"],
         template_id=template.id,
         csv_filename=file.filename,
-        total_rows=len(rows),
+        total_rows=total_rows,
         status="queued",
     )
     db.add(job)
     db.commit()
     db.refresh(job)
+    invalidate_stats(current_user["id"])
 
-    queue = get_queue()
+    lane = lane_for(total_rows, file.filename)
+    queue = get_queue(lane)
     enqueue_kwargs = {
-        "job_timeout": 600,
+        "job_timeout": bulk_job_timeout(total_rows),
         "retry": Retry(max=3),
     }
     # Windows doesn't support SIGALRM (used by RQ timeouts)
@@ -82,25 +150,39 @@ def create_bulk_job(
         job.id,
         current_user["id"],
         template.id,
-        rows,
+        csv_key,
+        meta=enqueue_meta(lane, current_user["id"]),
         **enqueue_kwargs,
     )
-    logger.info("bulk_job_enqueued user=%s job_id=%s", current_user["id"], job.id)
+    logger.info("bulk_job_enqueued user=%s job_id=%s lane=%s", current_user["id"], job.id, lane)
 
-    return job
+    return BulkJobResponse.model_validate(job).model_copy(
+        update={"validation": CsvValidationReport.model_validate(validation)}
+    )
 
 
-@router.get("/", response_model=list[BulkJobListResponse])
+@router.get("/", response_model=BulkJobListPage)
 def list_bulk_jobs(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    return (
-        db.query(BulkJob)
-        .filter(BulkJob.user_id == current_user["id"])
-        .order_by(BulkJob.created_at.desc())
-        .all()
+    columns = (
+        BulkJob.id,
+        BulkJob.kind,
+        BulkJob.csv_filename,
+        BulkJob.total_rows,
+        BulkJob.processed_rows,
+        BulkJob.failed_rows,
+        BulkJob.status,
+        BulkJob.created_at,
+        BulkJob.updated_at,
     )
+    try:
+        return keyset_page(db, BulkJob, columns, current_user["id"], cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 @router.get("/{job_id}", response_model=BulkJobResponse)
@@ -116,7 +198,135 @@ def get_bulk_job(
     )
     if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
-    return job
+    response = BulkJobResponse.model_validate(job)
+    if job.status not in ("queued", "processing"):
+        return response
+
+    # The row is only flushed periodically while the job runs; serve the
+    # live counters the workers keep in Redis.
+    try:
+        live = read_progress(get_progress_redis(), job.id)
+    except Exception as exc:
+        logger.warning("bulk_progress_unavailable job_id=%s error=%s", job.id, str(exc))
+        live = None
+    if not live:
+        return response
+    return response.model_copy(
+        update={
+            "status": live["status"],
+            "processed_rows": live["processed_rows"],
+            "failed_rows": live["failed_rows"],
+        }
+    )
+
+
+def _sse(event: dict) -> str:
+    return f"data: {json.dumps(event, default=str)}\n\n"
+
+
+@router.get("/{job_id}/events")
+def stream_bulk_job_events(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Server-Sent Events stream of a job's progress.
+
+    The first event is the current state; after that the stream relays the
+    counts (and latest row errors) workers publish, and closes after the
+    event carrying a final status and ``zip_url``.
+    """
+    job = (
+        db.query(BulkJob)
+        .filter(BulkJob.id == job_id, BulkJob.user_id == current_user["id"])
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    snapshot = {
+        "status": job.status,
+        "processed_rows": job.processed_rows,
+        "failed_rows": job.failed_rows,
+        "total_rows": job.total_rows,
+        "zip_url": job.zip_url,
+        "error": job.error,
+    }
+
+    async def events():
+        async with progress_hub.subscribe(job_id) as queue:
+            if snapshot["status"] not in FINAL_STATUSES:
+                # Counts in the row lag behind Redis, and the job may have
+                # finished between the query above and subscribing.
+                try:
+                    live = await progress_hub.read_progress(job_id)
+                except Exception as exc:
+                    logger.warning("bulk_progress_unavailable job_id=%s error=%s", job_id, str(exc))
+                    live = None
+                snapshot.update(live or {})
+            yield _sse(snapshot)
+            if snapshot["status"] in FINAL_STATUSES:
+                return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+                if event.get("status") in FINAL_STATUSES:
+                    return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _job_rows(db: Session, job_id: str, user_id: str, row_status: str, after: int, limit: int):
+    job = (
+        db.query(BulkJob.id)
+        .filter(BulkJob.id == job_id, BulkJob.user_id == user_id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    items = (
+        db.query(BulkJobResult)
+        .filter(
+            BulkJobResult.job_id == job_id,
+            BulkJobResult.status == row_status,
+            BulkJobResult.row_number > after,
+        )
+        .order_by(BulkJobResult.row_number)
+        .limit(limit + 1)
+        .all()
+    )
+    next_after = items[limit - 1].row_number if len(items) > limit else None
+    return {"items": items[:limit], "next_after": next_after}
+
+
+@router.get("/{job_id}/results", response_model=BulkJobResultPage)
+def list_bulk_job_results(
+    job_id: str,
+    after: int = Query(0, ge=0, description="Return rows after this CSV row number"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    return _job_rows(db, job_id, current_user["id"], "completed", after, limit)
+
+
+@router.get("/{job_id}/errors", response_model=BulkJobErrorPage)
+def list_bulk_job_errors(
+    job_id: str,
+    after: int = Query(0, ge=0, description="Return rows after this CSV row number"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    return _job_rows(db, job_id, current_user["id"], "failed", after, limit)
 
 
 @router.delete("/{job_id}")
@@ -132,6 +342,8 @@ def delete_bulk_job(
     )
     if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    db.query(BulkJobResult).filter(BulkJobResult.job_id == job.id).delete(synchronize_session=False)
     db.delete(job)
     db.commit()
+    invalidate_stats(current_user["id"])
     return {"message": "Bulk job deleted"}
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.dependencies import get_db, get_current_user
 from app.models import BulkJob
+from app.services.job_progress import get_progress_redis
+from app.services.job_queue import queue_stats
+from app.services.job_stats import get_stats
 
 router = APIRouter()
+logger = logging.getLogger("app.bulk")
 
 
 @router.get("/stats")
@@ -13,19 +18,8 @@ def job_stats(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    total = db.query(func.count(BulkJob.id)).filter(BulkJob.user_id == current_user["id"]).scalar()
-    queued = db.query(func.count(BulkJob.id)).filter(BulkJob.user_id == current_user["id"], BulkJob.status == "queued").scalar()
-    processing = db.query(func.count(BulkJob.id)).filter(BulkJob.user_id == current_user["id"], BulkJob.status == "processing").scalar()
-    completed = db.query(func.count(BulkJob.id)).filter(BulkJob.user_id == current_user["id"], BulkJob.status == "completed").scalar()
-    failed = db.query(func.count(BulkJob.id)).filter(BulkJob.user_id == current_user["id"], BulkJob.status == "failed").scalar()
-
-    return {
-        "total_jobs": total or 0,
-        "queued": queued or 0,
-        "processing": processing or 0,
-        "completed": completed or 0,
-        "failed": failed or 0,
-    }
+    """Job and page counts by status, template count and average SEO score, cached briefly per user."""
+    return get_stats(db, current_user["id"])
 
 
 @router.get("/recent")
@@ -42,3 +36,13 @@ def recent_jobs(
         .all()
     )
     return jobs
+
+
+@router.get("/queues")
+def queue_lanes(current_user: dict = Depends(get_current_user)):
+    """Depth and queue latency of each worker lane."""
+    try:
+        return queue_stats(get_progress_redis())
+    except Exception as exc:
+        logger.warning("bulk_queue_stats_unavailable error=%s", str(exc))
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Queue stats unavailable") from exc
@@ -1,15 +1,19 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
 from app.dependencies import get_db, get_current_user, supabase
 from app.models import Template, Page
-from app.schemas import PageCreate, PageResponse, PageListResponse
+from app.schemas import PageCreate, PageResponse, PageListPage, PageRouteResponse, PageSearchPage
 from app.services.page_service import generate_page
+from app.services.job_stats import invalidate_stats
+from app.services.page_search import search_pages
+from app.services.pagination import keyset_page
+from app.services.slug_cache import invalidate_slug, resolve_slug
 from app.services.template_service import render_template
 from app.services.storage_service import StorageService
-from app.utils.seo import validate_seo
+from app.services.uniqueness import UniquenessIndex
 
 router = APIRouter()
 logger = logging.getLogger("app.pages")
@@ -64,18 +68,8 @@ def create_page(
     if not meta_description:
         meta_description = ""
 
-    base_title = title
-    suffix = 2
-    while True:
-        existing_title = (
-            db.query(Page)
-            .filter(Page.user_id == current_user["id"], Page.title == title)
-            .first()
-        )
-        if not existing_title:
-            break
-        title = f"{base_title} ({suffix})"
-        suffix += 1
+    titles = UniquenessIndex.load(db, Page.title, current_user["id"], prefix=title)
+    title = titles.claim_title(title)
 
     # Allow duplicate meta descriptions.
 
@@ -90,13 +84,6 @@ def create_page(
             str(exc),
         )
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    score, seo_data = validate_seo(rendered_preview, title, meta_description)
-    if seo_data.get("issues"):
-        logger.info(
-            "seo_issues_not_enforced user=%s issues=%s",
-            current_user["id"],
-            "; ".join(seo_data["issues"]),
-        )
 
     storage = StorageService(supabase)
     page, _ = generate_page(
@@ -109,23 +96,60 @@ def create_page(
         slug=payload.slug,
         storage=storage,
         is_bulk=False,
+        rendered=rendered_preview,
     )
+    if (page.seo_data or {}).get("issues"):
+        logger.info(
+            "seo_issues_not_enforced user=%s issues=%s",
+            current_user["id"],
+            "; ".join(page.seo_data["issues"]),
+        )
+    invalidate_slug(current_user["id"], page.slug)
+    invalidate_stats(current_user["id"])
     logger.info("create_page_success user=%s page_id=%s", current_user["id"], page.id)
     return page
 
 
-@router.get("/", response_model=List[PageListResponse])
+@router.get("/", response_model=PageListPage)
 def list_pages(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    pages = (
-        db.query(Page)
-        .filter(Page.user_id == current_user["id"])
-        .order_by(Page.created_at.desc())
-        .all()
-    )
-    return pages
+    columns = (Page.id, Page.title, Page.slug, Page.seo_score, Page.status, Page.created_at, Page.updated_at)
+    try:
+        return keyset_page(db, Page, columns, current_user["id"], cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/slug/{slug}", response_model=PageRouteResponse)
+def get_page_by_slug(
+    slug: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Routing fields of the page with ``slug``, for resolving visitor URLs."""
+    route = resolve_slug(db, current_user["id"], slug)
+    if route is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
+    return route
+
+
+@router.get("/search/{query:path}", response_model=PageSearchPage)
+def search_user_pages(
+    query: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Pages whose title, meta description, slug or body text match every term of ``query``, best first."""
+    try:
+        return search_pages(db, current_user["id"], query, skip, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exc)) from exc
 
 
 @router.get("/{page_id}", response_model=PageResponse)
@@ -157,6 +181,9 @@ def delete_page(
     )
     if not page:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page not found")
+    slug = page.slug
     db.delete(page)
     db.commit()
+    invalidate_slug(current_user["id"], slug)
+    invalidate_stats(current_user["id"])
     return {"message": "Page deleted"}
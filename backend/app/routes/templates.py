@@ -1,18 +1,26 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from rq import Retry
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
 from app.dependencies import get_db, get_current_user
-from app.models import Template, TemplateVariable
+from app.models import BulkJob, Page, Template, TemplateVariable
+from app.routes.bulk import get_queue
 from app.schemas import (
+    BulkJobResponse,
     TemplateCreate,
     TemplateUpdate,
     TemplateResponse,
-    TemplateListResponse,
+    TemplateListPage,
     TemplateValidationRequest,
     TemplateValidationResponse,
 )
+from app.services.job_queue import enqueue_meta, lane_for
+from app.services.job_stats import invalidate_stats
+from app.services.pagination import keyset_page
 from app.services.template_service import validate_html
 from app.utils.seo import word_count
 
@@ -20,6 +28,45 @@ router = APIRouter()
 logger = logging.getLogger("app.templates")
 
 
+def enqueue_regeneration(db: Session, template: Template, user_id: str) -> BulkJob | None:
+    """Queue a job re-rendering the template's pages; ``None`` when it has none."""
+    pages = (
+        db.query(func.count(Page.id))
+        .filter(Page.template_id == template.id, Page.user_id == user_id)
+        .scalar()
+        or 0
+    )
+    if not pages:
+        return None
+    job = BulkJob(user_id=user_id, template_id=template.id, kind="regenerate", total_rows=pages, status="queued")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    invalidate_stats(user_id)
+
+    lane = lane_for(pages)
+    enqueue_kwargs = {"job_timeout": 3600, "retry": Retry(max=3)}
+    # Windows doesn't support SIGALRM (used by RQ timeouts)
+    if os.name == "nt":
+        enqueue_kwargs.pop("job_timeout", None)
+    get_queue(lane).enqueue(
+        "worker.jobs.regenerate_template_pages",
+        job.id,
+        user_id,
+        template.id,
+        meta=enqueue_meta(lane, user_id),
+        **enqueue_kwargs,
+    )
+    logger.info(
+        "template_regeneration_enqueued user=%s template_id=%s job_id=%s pages=%s",
+        user_id,
+        template.id,
+        job.id,
+        pages,
+    )
+    return job
+
+
 @router.post("/", response_model=TemplateResponse)
 def create_template(
     payload: TemplateCreate,
@@ -44,22 +91,24 @@ def create_template(
     for var in variables:
         db.add(TemplateVariable(template_id=template.id, name=var, required=True))
     db.commit()
+    invalidate_stats(current_user["id"])
 
     logger.info("create_template_success user=%s template_id=%s", current_user["id"], template.id)
     return template
 
 
-@router.get("/", response_model=List[TemplateListResponse])
+@router.get("/", response_model=TemplateListPage)
 def list_templates(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    return (
-        db.query(Template)
-        .filter(Template.user_id == current_user["id"])
-        .order_by(Template.created_at.desc())
-        .all()
-    )
+    columns = (Template.id, Template.name, Template.variables, Template.created_at, Template.updated_at)
+    try:
+        return keyset_page(db, Template, columns, current_user["id"], cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 @router.get("/{template_id}", response_model=TemplateResponse)
@@ -95,6 +144,7 @@ def update_template(
 
     if payload.name is not None:
         template.name = payload.name
+    html_changed = payload.html_content is not None and payload.html_content != template.html_content
     if payload.html_content is not None:
         template.html_content = payload.html_content
         validation = validate_html(payload.html_content)
@@ -105,7 +155,31 @@ def update_template(
 
     db.commit()
     db.refresh(template)
-    return template
+    response = TemplateResponse.model_validate(template)
+    if html_changed:
+        job = enqueue_regeneration(db, template, current_user["id"])
+        if job is not None:
+            response = response.model_copy(update={"regeneration_job_id": job.id})
+    return response
+
+
+@router.post("/{template_id}/regenerate", response_model=BulkJobResponse)
+def regenerate_template_pages(
+    template_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    template = (
+        db.query(Template)
+        .filter(Template.id == template_id, Template.user_id == current_user["id"])
+        .first()
+    )
+    if not template:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    job = enqueue_regeneration(db, template, current_user["id"])
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Template has no pages")
+    return job
 
 
 @router.delete("/{template_id}")
@@ -123,6 +197,7 @@ def delete_template(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
     db.delete(template)
     db.commit()
+    invalidate_stats(current_user["id"])
     return {"message": "Template deleted"}
 
 
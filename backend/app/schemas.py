@@ -27,6 +27,8 @@ class TemplateResponse(BaseModel):
     seo_checks: Dict[str, Any]
     created_at: datetime
     updated_at: datetime
+    # Set when an edit queued re-rendering of the template's pages.
+    regeneration_job_id: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -43,6 +45,11 @@ class TemplateListResponse(BaseModel):
         from_attributes = True
 
 
+class TemplateListPage(BaseModel):
+    items: List[TemplateListResponse]
+    next_cursor: Optional[str] = None
+
+
 class PageCreate(BaseModel):
     template_id: str
     variables: Dict[str, str]
@@ -84,6 +91,36 @@ class PageListResponse(BaseModel):
         from_attributes = True
 
 
+class PageListPage(BaseModel):
+    items: List[PageListResponse]
+    next_cursor: Optional[str] = None
+
+
+class PageRouteResponse(BaseModel):
+    id: str
+    slug: str
+    storage_url: str
+    status: Optional[str] = None
+
+
+class PageSearchResult(BaseModel):
+    id: str
+    title: str
+    slug: str
+    meta_description: str
+    storage_url: str
+    seo_score: Optional[int] = None
+    status: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    rank: float
+
+
+class PageSearchPage(BaseModel):
+    items: List[PageSearchResult]
+    next_skip: Optional[int] = None
+
+
 class TemplateValidationRequest(BaseModel):
     html_content: str = Field(..., min_length=20)
 
@@ -104,26 +141,112 @@ class SingleRenderResponse(BaseModel):
     word_count: int
 
 
+class CsvValidationIssue(BaseModel):
+    code: str
+    severity: str
+    message: str
+    column: Optional[str] = None
+    count: int
+    rows: List[int]
+
+
+class CsvValidationReport(BaseModel):
+    total_rows: int
+    checked_rows: int
+    render_checked_rows: int
+    valid: bool
+    issues: List[CsvValidationIssue]
+    elapsed_ms: float
+
+
+class BulkPreviewPage(BaseModel):
+    row_number: int
+    title: str
+    slug: str
+    seo_score: Optional[int] = None
+    seo_data: Optional[Dict[str, Any]] = None
+    html: Optional[str] = None
+    render_ms: Optional[float] = None
+    seo_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class BulkPreviewTimings(BaseModel):
+    read_ms: float
+    render_ms_per_row: float
+    seo_ms_per_row: float
+
+
+class BulkPreviewEstimate(BaseModel):
+    render_processes: int
+    seconds: float
+
+
+class BulkPreviewResponse(BaseModel):
+    total_rows: int
+    sampled_rows: int
+    failed_rows: int
+    pages: List[BulkPreviewPage]
+    timings: BulkPreviewTimings
+    estimate: BulkPreviewEstimate
+    validation: Optional[CsvValidationReport] = None
+
+
 class BulkJobResponse(BaseModel):
     id: str
     user_id: str
     template_id: Optional[str]
+    kind: str = "generate"
     csv_filename: Optional[str]
     total_rows: int
     processed_rows: int
     failed_rows: int
     status: str
-    result_urls: List[Dict[str, Any]]
-    errors: List[Dict[str, Any]]
+    zip_url: Optional[str] = None
+    zip_parts: Optional[List[str]] = None
+    error: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    validation: Optional[CsvValidationReport] = None
+
+    class Config:
+        from_attributes = True
+
+
+class BulkJobResultResponse(BaseModel):
+    row_number: int
+    page_id: Optional[str]
+    url: Optional[str]
+    title: Optional[str]
+    slug: Optional[str]
+    seo_score: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+
+class BulkJobErrorResponse(BaseModel):
+    row_number: int
+    error: Optional[str]
+    data: Optional[Dict[str, Any]]
 
     class Config:
         from_attributes = True
 
 
+class BulkJobResultPage(BaseModel):
+    items: List[BulkJobResultResponse]
+    next_after: Optional[int] = None
+
+
+class BulkJobErrorPage(BaseModel):
+    items: List[BulkJobErrorResponse]
+    next_after: Optional[int] = None
+
+
 class BulkJobListResponse(BaseModel):
     id: str
+    kind: str = "generate"
     csv_filename: Optional[str]
     total_rows: int
     processed_rows: int
@@ -134,3 +257,8 @@ class BulkJobListResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BulkJobListPage(BaseModel):
+    items: List[BulkJobListResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from itertools import zip_longest
+from typing import BinaryIO, Dict, List
+import csv
+import io
+import time
+
+from app.config import settings
+from app.models import Template
+from app.services.page_service import build_slug, bulk_row_fields, robots_for
+from app.services.seo_service import evaluate_and_inject
+from app.services.template_service import render_template
+
+
+def sample_indexes(total_rows: int, sample: int) -> List[int]:
+    """``sample`` row indexes (0-based) spread evenly over the file, first row included."""
+    if total_rows <= 0 or sample <= 0:
+        return []
+    step = max(1, total_rows // sample)
+    return list(range(0, total_rows, step))[:sample]
+
+
+def _read_sample(fileobj: BinaryIO, indexes: List[int]) -> List[tuple]:
+    """``(index, row)`` for the wanted rows; only those are turned into dicts."""
+    wanted = set(indexes)
+    last = max(indexes)
+    rows = []
+    start = fileobj.tell()
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None) or []
+        # Blank lines are skipped, as by DictReader in the worker.
+        for i, values in enumerate(values for values in reader if values):
+            if i in wanted:
+                rows.append((i, dict(zip_longest(header, values[: len(header)]))))
+            if i >= last:
+                break
+    finally:
+        text.detach()
+        fileobj.seek(start)
+    return rows
+
+
+def build_preview(fileobj: BinaryIO, template: Template, total_rows: int, sample: int) -> Dict:
+    """Render a sample of an ingested CSV exactly as the worker would, without side effects.
+
+    Rows go through ``render_template`` and the SEO post-processing only:
+    nothing is uploaded and no ``Page`` is written, so slugs are the base
+    slug the worker starts from (it may add a suffix to keep them unique).
+    Per-row stage timings are extrapolated to the whole file; the estimate
+    covers rendering and post-processing spread over
+    ``settings.render_processes``, not uploads or inserts.
+    """
+    started = time.perf_counter()
+    rows = _read_sample(fileobj, sample_indexes(total_rows, sample))
+    read_ms = (time.perf_counter() - started) * 1000
+
+    robots = robots_for(True)
+    pages = []
+    render_total = 0.0
+    seo_total = 0.0
+    rendered_rows = 0
+    for i, row in rows:
+        variables, title, meta_description, slug = bulk_row_fields(i, row)
+        page = {
+            "row_number": i + 1,
+            "title": title,
+            "slug": build_slug(slug or title),
+            "seo_score": None,
+            "seo_data": None,
+            "html": None,
+            "render_ms": None,
+            "seo_ms": None,
+            "error": None,
+        }
+        pages.append(page)
+        try:
+            mark = time.perf_counter()
+            rendered = render_template(template.html_content, variables)
+            render_ms = (time.perf_counter() - mark) * 1000
+            mark = time.perf_counter()
+            score, seo_data, html = evaluate_and_inject(
+                rendered,
+                title=title,
+                meta_description=meta_description,
+                canonical_url="",
+                robots=robots,
+            )
+            seo_ms = (time.perf_counter() - mark) * 1000
+        except Exception as exc:
+            page["error"] = str(exc)
+            continue
+        page.update(
+            seo_score=score,
+            seo_data=seo_data,
+            html=html,
+            render_ms=round(render_ms, 3),
+            seo_ms=round(seo_ms, 3),
+        )
+        render_total += render_ms
+        seo_total += seo_ms
+        rendered_rows += 1
+
+    render_per_row = render_total / rendered_rows if rendered_rows else 0.0
+    seo_per_row = seo_total / rendered_rows if rendered_rows else 0.0
+    processes = max(1, settings.render_processes)
+    return {
+        "total_rows": total_rows,
+        "sampled_rows": len(pages),
+        "failed_rows": len(pages) - rendered_rows,
+        "pages": pages,
+        "timings": {
+            "read_ms": round(read_ms, 3),
+            "render_ms_per_row": round(render_per_row, 3),
+            "seo_ms_per_row": round(seo_per_row, 3),
+        },
+        "estimate": {
+            "render_processes": processes,
+            "seconds": round((render_per_row + seo_per_row) * total_rows / processes / 1000, 1),
+        },
+    }
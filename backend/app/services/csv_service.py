@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple
+import codecs
+import csv
+import io
+import tempfile
+import uuid
+
+from app.services.storage_service import StorageService
+
+
+ENCODING_SAMPLE_BYTES = 64 * 1024
+SPOOL_MAX_BYTES = 1024 * 1024
+# Excel on Windows exports CSV as cp1252; anything that is not valid UTF-8 is read that way.
+FALLBACK_ENCODING = "cp1252"
+
+
+def csv_key(user_id: str) -> str:
+    return f"{user_id}/uploads/{uuid.uuid4().hex}.csv"
+
+
+def detect_encoding(fileobj: BinaryIO) -> str:
+    """Guess the encoding of a CSV from its BOM and first bytes, leaving the position unchanged."""
+    start = fileobj.tell()
+    sample = fileobj.read(ENCODING_SAMPLE_BYTES)
+    fileobj.seek(start)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        # final=False tolerates a multi-byte character cut off by the sample size.
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+
+
+def _scan(
+    fileobj: BinaryIO,
+    encoding: str,
+    required: Iterable[str],
+    out: BinaryIO | None,
+) -> int:
+    # The fallback decodes every byte, so only genuine UTF-8/16 errors abort.
+    errors = "replace" if encoding == FALLBACK_ENCODING else "strict"
+    text = io.TextIOWrapper(fileobj, encoding=encoding, errors=errors, newline="")
+    try:
+        lines: Iterable[str] = text
+        if out is not None:
+            lines = _tee_utf8(text, out)
+        reader = csv.reader(lines)
+
+        header = next(reader, None) or []
+        missing = set(required) - set(header)
+        if missing:
+            raise ValueError(f"CSV missing required columns: {', '.join(sorted(missing))}")
+
+        # DictReader skips blank lines, so they are not rows here either.
+        return sum(1 for row in reader if row)
+    finally:
+        text.detach()
+
+
+def _tee_utf8(lines: Iterable[str], out: BinaryIO) -> Iterator[str]:
+    for line in lines:
+        out.write(line.encode("utf-8"))
+        yield line
+
+
+def ingest_csv(fileobj: BinaryIO, required: Iterable[str]) -> Tuple[BinaryIO, int]:
+    """Validate and count an uploaded CSV in one streaming pass.
+
+    ``fileobj`` must be seekable (FastAPI uploads are spooled temp files). The
+    header is checked against ``required`` before any row is read. Returns a
+    UTF-8 file positioned at the start, ready for ``store_csv``, and the row
+    count: the upload itself when it already is UTF-8, otherwise a transcoded
+    spooled copy. Raises ``ValueError`` for missing columns or an empty CSV.
+    """
+    required = list(required)
+    start = fileobj.tell()
+    encoding = detect_encoding(fileobj)
+
+    if encoding == "utf-8":
+        try:
+            total = _scan(fileobj, encoding, required, None)
+            fileobj.seek(start)
+            if not total:
+                raise ValueError("CSV has no rows")
+            return fileobj, total
+        except UnicodeDecodeError:
+            # Invalid UTF-8 after the sampled prefix.
+            encoding = FALLBACK_ENCODING
+            fileobj.seek(start)
+
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        try:
+            total = _scan(fileobj, encoding, required, out)
+        except UnicodeDecodeError as exc:
+            raise ValueError(f"Could not decode CSV as {encoding}") from exc
+        if not total:
+            raise ValueError("CSV has no rows")
+    except Exception:
+        out.close()
+        raise
+    out.seek(0)
+    return out, total
+
+
+def store_csv(storage: StorageService, user_id: str, fileobj: BinaryIO) -> str:
+    """Persist an uploaded CSV and return the key bulk jobs are enqueued with.
+
+    ``storage`` is the private upload store (``upload_storage``), never the
+    public pages bucket. Only the key travels through Redis, so queue memory
+    per job does not grow with the size of the upload. The key is random and
+    the object is removed once the job finishes.
+    """
+    key = csv_key(user_id)
+    storage.upload_file_with_key(key, fileobj, "text/csv")
+    return key
+
+
+def shard_key(key: str, index: int) -> str:
+    base = key[: -len(".csv")] if key.endswith(".csv") else key
+    return f"{base}.shard-{index}.csv"
+
+
+def split_csv(storage: StorageService, key: str, size: int) -> List[Tuple[str, int]]:
+    """Store a CSV's rows as one CSV per ``size`` rows, each with the header.
+
+    One pass over the stored CSV up front lets every shard of a bulk job read
+    only its own rows instead of parsing the file up to its start. Rows are
+    counted like ``csv.DictReader`` yields them (blank lines skipped). Returns
+    ``(key, row count)`` per shard, in row order.
+    """
+    size = max(1, size)
+    shards: List[Tuple[str, int]] = []
+    with storage.open_read(key) as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        try:
+            reader = csv.reader(text)
+            header = next(reader, None) or []
+            rows = (row for row in reader if row)
+            while True:
+                with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as out:
+                    writer_text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+                    writer = csv.writer(writer_text)
+                    writer.writerow(header)
+                    count = 0
+                    for row in rows:
+                        writer.writerow(row)
+                        count += 1
+                        if count == size:
+                            break
+                    writer_text.flush()
+                    writer_text.detach()
+                    if not count:
+                        break
+                    out.seek(0)
+                    part = shard_key(key, len(shards))
+                    storage.upload_file_with_key(part, out, "text/csv")
+                    shards.append((part, count))
+        finally:
+            text.detach()
+    return shards
+
+
+def iter_csv_rows(storage: StorageService, key: str) -> Iterator[Dict[str, str]]:
+    """Yield rows of a stored (UTF-8) CSV one at a time."""
+    with storage.open_read(key) as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        try:
+            yield from csv.DictReader(text)
+        finally:
+            text.detach()
+
+
+def iter_job_rows(storage: StorageService, source: str | List[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+    """Rows of a bulk job enqueued with a stored CSV key, or with a list of rows by older API versions."""
+    if isinstance(source, str):
+        return iter_csv_rows(storage, source)
+    return iter(source or [])
+
+
+def delete_csv(storage: StorageService, key: str) -> None:
+    storage.delete([key])
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from itertools import islice, zip_longest
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+import csv
+import io
+import re
+import string
+import time
+
+from app.config import settings
+from app.models import Template
+from app.services.page_service import build_slug
+from app.services.template_service import render_template
+
+SAMPLE_ROWS = 10
+MAX_FIELD_LENGTH = 255
+# Same lookups as ``page_service.bulk_row_fields``.
+TITLE_KEYS = ["title", "name"]
+DESCRIPTION_KEYS = ["meta_description", "description"]
+
+_ASCII_LOWER = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+# Everything but letters, digits and the NUL that separates joined values.
+_ASCII_DROP = bytes(b for b in range(128) if b and not chr(b).isalnum())
+_BLANK = re.compile(r"\x00\s*\x00")
+
+
+def _issue(code: str, severity: str, message: str, rows: List[int], column: Optional[str] = None) -> Dict:
+    return {
+        "code": code,
+        "severity": severity,
+        "message": message,
+        "column": column,
+        "count": len(rows),
+        "rows": rows[:SAMPLE_ROWS],
+    }
+
+
+def _read_columns(fileobj: BinaryIO, limit: int) -> Tuple[List[str], List[Sequence[str]], int]:
+    """Transpose up to ``limit`` rows of a UTF-8 CSV into one tuple per header column."""
+    start = fileobj.tell()
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    try:
+        reader = csv.reader(text)
+        header = [str(name).strip() for name in next(reader, None) or []]
+        rows = list(islice(reader, limit))
+        # DictReader skips blank lines, so they are not rows here either.
+        if [] in rows:
+            rows = [row for row in rows if row]
+    finally:
+        text.detach()
+        fileobj.seek(start)
+    if not rows:
+        return header, [() for _ in header], 0
+    # Short rows are padded like DictReader does; extra cells are ignored.
+    columns = list(zip_longest(*rows, fillvalue=""))[: len(header)]
+    columns += [("",) * len(rows)] * (len(header) - len(columns))
+    return header, columns, len(rows)
+
+
+def _pick_column(header: List[str], columns: List[Sequence[str]], keys: List[str]) -> List[str]:
+    """Per row, the first non-empty value ``page_service.pick_value`` would pick for ``keys``."""
+    order = [header.index(key) for key in keys if key in header]
+    order += [index for index, name in enumerate(header) if any(token in name.lower() for token in keys)]
+    if not order:
+        return [""] * (len(columns[0]) if columns else 0)
+    picked = list(columns[order[0]])
+    for index in order[1:]:
+        picked = [value or other for value, other in zip(picked, columns[index])]
+    return picked
+
+
+def _empty_rows(values: Sequence[str]) -> List[int]:
+    # One regex over the joined column finds out whether any row is blank.
+    if not _BLANK.search("\x00" + "\x00".join(values) + "\x00"):
+        return []
+    return [i + 1 for i, value in enumerate(values) if not value or value.isspace()]
+
+
+def _long_rows(values: Sequence[str]) -> List[int]:
+    if not values or max(map(len, values)) <= MAX_FIELD_LENGTH:
+        return []
+    return [i + 1 for i, value in enumerate(values) if len(value) > MAX_FIELD_LENGTH]
+
+
+def _repeats(values: Sequence[str]) -> List[int]:
+    """Row numbers of values already seen earlier in ``values``."""
+    counts = Counter(values)
+    if len(counts) == len(values):
+        return []
+    seen = set()
+    repeated = []
+    for i, value in enumerate(values):
+        if counts[value] > 1:
+            if value in seen:
+                repeated.append(i + 1)
+            seen.add(value)
+    return repeated
+
+
+def _ascii_key(text: str) -> str:
+    return text.encode("ascii").translate(_ASCII_LOWER, _ASCII_DROP).decode("ascii")
+
+
+def _slug_keys(values: Sequence[str]) -> List[str]:
+    """A key per value such that equal slugs imply equal keys.
+
+    For ASCII text without entities the slug keeps exactly the lowercase
+    letters and digits, so one ``bytes.translate`` over the whole column
+    gives the keys. Other values get their real slug, which is slow but rare.
+    """
+    text = "\x00".join(values)
+    if text.isascii() and "&" not in text:
+        return _ascii_key(text).split("\x00")
+    return [
+        _ascii_key(value) if value.isascii() and "&" not in value else build_slug(value).replace("-", "")
+        for value in values
+    ]
+
+
+def _slug_collisions(sources: Sequence[str]) -> List[int]:
+    """Row numbers whose slug an earlier row already takes (the worker adds a suffix)."""
+    if not sources:
+        return []
+    keys = _slug_keys(sources)
+    shared = {key for key, count in Counter(keys).items() if count > 1}
+    groups: Dict[str, List[int]] = defaultdict(list)
+    for i, key in enumerate(keys):
+        if key in shared:
+            groups[key].append(i)
+    collisions = []
+    for indexes in groups.values():
+        # Only rows sharing a key can share a slug; confirm with the real slugs.
+        seen = set()
+        for i in indexes:
+            slug = build_slug(sources[i])
+            if slug in seen:
+                collisions.append(i + 1)
+            seen.add(slug)
+    return sorted(collisions)
+
+
+def _render_errors(
+    template: Template, header: List[str], columns: List[Sequence[str]], total: int
+) -> Tuple[Dict[str, List[int]], int]:
+    """Render an evenly spread sample of rows; returns rows per error message and the sample size."""
+    sample = max(0, settings.csv_validation_render_sample)
+    if not total or not sample:
+        return {}, 0
+    step = max(1, total // sample)
+    errors: Dict[str, List[int]] = defaultdict(list)
+    checked = 0
+    for i in range(0, total, step)[:sample]:
+        checked += 1
+        variables = {name: column[i] for name, column in zip(header, columns)}
+        try:
+            render_template(template.html_content, variables)
+        except Exception as exc:
+            errors[str(exc).splitlines()[0] if str(exc) else type(exc).__name__].append(i + 1)
+    return errors, checked
+
+
+def validate_csv(fileobj: BinaryIO, template: Template, total_rows: int) -> Dict:
+    """Check every row of an ingested CSV against what the worker will do with it.
+
+    ``fileobj`` is the UTF-8 file ``ingest_csv`` returns; its position is left
+    unchanged. Each check runs over whole columns at once rather than row by
+    row: empty required values, rows that will get a generic title, titles
+    and descriptions the worker truncates, duplicate titles and slug
+    collisions within the file (renamed with a suffix by the worker), and
+    template render errors on a sample of ``settings.csv_validation_render_sample``
+    rows. Only the first ``settings.csv_validation_max_rows`` rows are checked.
+    """
+    started = time.perf_counter()
+    header, columns, checked = _read_columns(fileobj, settings.csv_validation_max_rows)
+    by_name = dict(zip(header, columns))
+    issues: List[Dict] = []
+
+    for name in template.variables or []:
+        empty = _empty_rows(by_name.get(name, ()))
+        if empty:
+            issues.append(_issue("empty_required", "warning", f"Empty value for '{name}'", empty, name))
+
+    picked_titles = _pick_column(header, columns, TITLE_KEYS)
+    titles = picked_titles
+    untitled = _empty_rows(picked_titles)
+    if untitled:
+        issues.append(_issue("missing_title", "warning", "No title; the page will be titled 'Page <row>'", untitled))
+        titles = [value or f"Page {i + 1}" for i, value in enumerate(picked_titles)]
+
+    long_titles = _long_rows(titles)
+    if long_titles:
+        message = f"Title longer than {MAX_FIELD_LENGTH} characters; it will be truncated"
+        issues.append(_issue("title_too_long", "warning", message, long_titles))
+    descriptions = _pick_column(header, columns, DESCRIPTION_KEYS)
+    long_descriptions = _long_rows(descriptions)
+    if long_descriptions:
+        message = f"Meta description longer than {MAX_FIELD_LENGTH} characters; it will be truncated"
+        issues.append(_issue("description_too_long", "warning", message, long_descriptions))
+
+    if long_titles:
+        titles = [value[:MAX_FIELD_LENGTH] for value in titles]
+    duplicate_titles = _repeats(titles)
+    if duplicate_titles:
+        message = "Title repeats an earlier row; a ' (n)' suffix will be added"
+        issues.append(_issue("duplicate_title", "warning", message, duplicate_titles))
+    # The worker slugs the slug column and falls back to the title.
+    slug_sources = titles
+    slugs = _pick_column(header, columns, ["slug"])
+    if any(slugs):
+        slug_sources = [slug or title for slug, title in zip(slugs, titles)]
+    collisions = _slug_collisions(slug_sources)
+    if collisions:
+        message = "Slug repeats an earlier row; a suffix will be added"
+        issues.append(_issue("duplicate_slug", "warning", message, collisions))
+
+    render_errors, render_checked = _render_errors(template, header, columns, checked)
+    for message, rows in render_errors.items():
+        issues.append(_issue("render_error", "error", message, rows))
+
+    return {
+        "total_rows": total_rows,
+        "checked_rows": checked,
+        "render_checked_rows": render_checked,
+        "valid": not any(issue["severity"] == "error" for issue in issues),
+        "issues": issues,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+import asyncio
+import json
+import logging
+import time
+
+from redis import Redis
+from redis import asyncio as aioredis
+
+from app.config import settings
+
+PROGRESS_TTL = 24 * 60 * 60
+# A finished job's final state is kept briefly for streams that subscribe late.
+FINISHED_TTL = 5 * 60
+RECENT_ERRORS = 5
+FINAL_STATUSES = ("completed", "completed_with_errors", "failed")
+
+_CHANNEL_PREFIX = "bulk:events:"
+
+logger = logging.getLogger("app.bulk")
+
+_redis: Optional[Redis] = None
+
+
+def get_progress_redis() -> Redis:
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(settings.redis_url)
+    return _redis
+
+
+def progress_key(job_id: str) -> str:
+    return f"bulk:progress:{job_id}"
+
+
+def progress_channel(job_id: str) -> str:
+    return f"{_CHANNEL_PREFIX}{job_id}"
+
+
+class JobProgress:
+    """Live counters of a running bulk job, kept in a Redis hash.
+
+    Workers (including every shard of a sharded job) increment the same hash
+    with HINCRBY as rows complete, so updates are atomic and O(1) no matter
+    how large the job is. The ``BulkJob`` row is only written periodically
+    and when the job ends; ``read_progress`` lets the API serve live numbers
+    in between. Updated counts are also published on the job's channel, at
+    most every ``settings.progress_publish_interval`` seconds, for
+    ``/api/bulk/{job_id}/events`` streams.
+    """
+
+    def __init__(self, redis: Redis, job_id: str):
+        self.redis = redis
+        self.key = progress_key(job_id)
+        self.channel = progress_channel(job_id)
+        self._published_at = 0.0
+        self._errors: List[Dict] = []
+
+    def start(self, total: int, processed: int = 0, failed: int = 0) -> None:
+        event = {"status": "processing", "processed_rows": processed, "failed_rows": failed, "total_rows": total}
+        pipe = self.redis.pipeline()
+        pipe.delete(self.key)
+        pipe.hset(self.key, mapping={"processed": processed, "failed": failed, "total": total, "status": "processing"})
+        pipe.expire(self.key, PROGRESS_TTL)
+        pipe.publish(self.channel, json.dumps(event))
+        pipe.execute()
+
+    def add(self, processed: int = 0, failed: int = 0, errors: Optional[List[Dict]] = None) -> None:
+        if errors:
+            self._errors = (self._errors + errors)[-RECENT_ERRORS:]
+        if not processed and not failed:
+            return
+        pipe = self.redis.pipeline()
+        pipe.hincrby(self.key, "processed", processed)
+        pipe.hincrby(self.key, "failed", failed)
+        pipe.expire(self.key, PROGRESS_TTL)
+        processed_rows, failed_rows, _ = pipe.execute()
+
+        now = time.monotonic()
+        if now - self._published_at < settings.progress_publish_interval:
+            return
+        self._published_at = now
+        event = {"status": "processing", "processed_rows": processed_rows, "failed_rows": failed_rows}
+        if self._errors:
+            event["errors"], self._errors = self._errors, []
+        self.redis.publish(self.channel, json.dumps(event))
+
+    def retrying(self, error: str) -> None:
+        # Not final: streams stay open while RQ runs the job again.
+        pipe = self.redis.pipeline()
+        pipe.hset(self.key, "status", "retrying")
+        pipe.expire(self.key, PROGRESS_TTL)
+        pipe.publish(self.channel, json.dumps({"status": "retrying", "error": error}))
+        pipe.execute()
+
+    def finish(
+        self,
+        status: str,
+        processed: int,
+        failed: int,
+        zip_url: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        # The BulkJob row is authoritative once the job has ended; the hash
+        # only lingers so a stream that subscribes late still sees the end.
+        event = {
+            "status": status,
+            "processed_rows": processed,
+            "failed_rows": failed,
+            "zip_url": zip_url,
+            "error": error,
+        }
+        pipe = self.redis.pipeline()
+        pipe.hset(
+            self.key,
+            mapping={"processed": processed, "failed": failed, "status": status, "zip_url": zip_url or "", "error": error or ""},
+        )
+        pipe.expire(self.key, FINISHED_TTL)
+        pipe.publish(self.channel, json.dumps(event))
+        pipe.execute()
+
+
+def _parse_progress(raw: Dict) -> Dict | None:
+    if not raw:
+        return None
+    values = {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in raw.items()
+    }
+    progress = {
+        "processed_rows": int(values.get("processed", 0)),
+        "failed_rows": int(values.get("failed", 0)),
+        "total_rows": int(values.get("total", 0)),
+        "status": values.get("status") or "processing",
+    }
+    if progress["status"] in FINAL_STATUSES:
+        progress["zip_url"] = values.get("zip_url") or None
+        progress["error"] = values.get("error") or None
+    return progress
+
+
+def read_progress(redis: Redis, job_id: str) -> Dict | None:
+    return _parse_progress(redis.hgetall(progress_key(job_id)))
+
+
+class ProgressHub:
+    """Fans job events from Redis pub/sub out to SSE streams of this process.
+
+    One pattern subscription serves every open stream, so the number of
+    Redis connections does not grow with the number of dashboards watching.
+    Events carry absolute counts, so a slow stream whose queue is full can
+    safely drop the oldest one.
+    """
+
+    QUEUE_SIZE = 32
+
+    def __init__(self):
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._redis: Optional[aioredis.Redis] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def redis(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.Redis.from_url(settings.redis_url)
+        return self._redis
+
+    async def read_progress(self, job_id: str) -> Dict | None:
+        return _parse_progress(await self.redis.hgetall(progress_key(job_id)))
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(f"{_CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    job_id = message["channel"].decode()[len(_CHANNEL_PREFIX):]
+                    listeners = self._listeners.get(job_id)
+                    if listeners:
+                        self._dispatch(listeners, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("bulk_events_subscription_lost error=%s", str(exc))
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    @staticmethod
+    def _dispatch(listeners: Set[asyncio.Queue], event: Dict) -> None:
+        for queue in listeners:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Queue]:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._listeners.setdefault(job_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            listeners = self._listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(queue)
+                if not listeners:
+                    del self._listeners[job_id]
+
+
+progress_hub = ProgressHub()
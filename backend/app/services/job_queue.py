@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+import math
+import time
+
+from redis import Redis
+from rq import Queue, SimpleWorker, Worker
+from rq.job import Job, JobStatus
+from rq.utils import utcnow
+
+from app.config import settings
+
+# Lanes in the order workers drain them: a worker only takes work from a lane
+# when every lane before it is empty.
+LANES = ("interactive", "small", "large")
+# Jobs enqueued before lanes existed; drained last.
+LEGACY_QUEUE = "bulk"
+SINGLE_PAGE_FILENAME = "single-page.csv"
+LATENCY_SAMPLES = 500
+
+logger = logging.getLogger("app.bulk")
+
+
+def lane_for(total_rows: int, csv_filename: Optional[str] = None) -> str:
+    """Pick the lane of a bulk job from its size."""
+    if csv_filename == SINGLE_PAGE_FILENAME or total_rows <= settings.queue_interactive_max_rows:
+        return "interactive"
+    if total_rows <= settings.queue_small_max_rows:
+        return "small"
+    return "large"
+
+
+def bulk_job_timeout(total_rows: int, sharded: bool = True) -> int:
+    """RQ timeout of a ``process_bulk_job`` run over ``total_rows`` rows.
+
+    Up to ``settings.bulk_shard_size`` rows the job does one shard's work.
+    Larger stored CSVs are split and fanned out, which still reads every row;
+    parsed rows (``sharded=False``) are all generated inline.
+    """
+    if not sharded:
+        return settings.bulk_shard_timeout * max(1, math.ceil(total_rows / settings.bulk_shard_size))
+    if total_rows <= settings.bulk_shard_size:
+        return settings.bulk_shard_timeout
+    return settings.bulk_shard_timeout + math.ceil(total_rows / settings.bulk_split_rows_per_second)
+
+
+def lane_queue_name(lane: str) -> str:
+    return f"{LEGACY_QUEUE}-{lane}"
+
+
+def get_lane_queue(lane: str, connection: Redis) -> Queue:
+    return Queue(lane_queue_name(lane), connection=connection)
+
+
+def lane_queues(connection: Redis) -> List[Queue]:
+    """Every queue a worker listens on, highest priority first."""
+    return [get_lane_queue(lane, connection) for lane in LANES] + [Queue(LEGACY_QUEUE, connection=connection)]
+
+
+def enqueue_meta(lane: str, tenant: str) -> Dict:
+    return {"lane": lane, "tenant": tenant}
+
+
+def _slots_key(tenant: str) -> str:
+    return f"bulk:tenant:{tenant}:running"
+
+
+def _latency_key(lane: str) -> str:
+    return f"bulk:queue_latency:{lane}"
+
+
+def _lane_stats_key(lane: str) -> str:
+    return f"bulk:queue_stats:{lane}"
+
+
+def acquire_tenant_slot(redis: Redis, tenant: str, token: str, ttl: int) -> bool:
+    """Claim one of the tenant's ``settings.bulk_tenant_max_running`` slots.
+
+    Slots are members of a sorted set scored by their expiry, so a slot held
+    by a worker that died frees itself once the job's timeout has passed.
+    """
+    limit = settings.bulk_tenant_max_running
+    if limit <= 0:
+        return True
+    key = _slots_key(tenant)
+    now = time.time()
+    pipe = redis.pipeline()
+    pipe.zremrangebyscore(key, "-inf", now)
+    pipe.zadd(key, {token: now + ttl})
+    pipe.zcard(key)
+    _, _, running = pipe.execute()
+    if running <= limit:
+        return True
+    # Two workers racing for the last slot may both back off; the job is
+    # simply deferred again.
+    redis.zrem(key, token)
+    return False
+
+
+def release_tenant_slot(redis: Redis, tenant: str, token: str) -> None:
+    if settings.bulk_tenant_max_running > 0:
+        redis.zrem(_slots_key(tenant), token)
+
+
+def record_queue_latency(redis: Redis, lane: str, seconds: float) -> None:
+    pipe = redis.pipeline()
+    pipe.lpush(_latency_key(lane), f"{seconds:.3f}")
+    pipe.ltrim(_latency_key(lane), 0, LATENCY_SAMPLES - 1)
+    pipe.hincrby(_lane_stats_key(lane), "started", 1)
+    pipe.hincrbyfloat(_lane_stats_key(lane), "wait_seconds", seconds)
+    pipe.execute()
+
+
+def record_deferral(redis: Redis, lane: str) -> None:
+    redis.hincrby(_lane_stats_key(lane), "deferred", 1)
+
+
+def _percentile(samples: List[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def queue_stats(redis: Redis) -> Dict[str, Dict]:
+    """Depth and queue latency (enqueue to start, in seconds) of every lane.
+
+    Percentiles cover the last ``LATENCY_SAMPLES`` jobs started in the lane;
+    ``started`` and ``avg_wait`` are lifetime totals.
+    """
+    pipe = redis.pipeline()
+    for lane in LANES:
+        pipe.llen(get_lane_queue(lane, redis).key)
+        pipe.lrange(_latency_key(lane), 0, -1)
+        pipe.hgetall(_lane_stats_key(lane))
+    replies = pipe.execute()
+
+    stats = {}
+    for index, lane in enumerate(LANES):
+        queued, samples, totals = replies[index * 3:index * 3 + 3]
+        samples = sorted(float(sample) for sample in samples)
+        totals = {(k.decode() if isinstance(k, bytes) else k): float(v) for k, v in totals.items()}
+        started = int(totals.get("started", 0))
+        stats[lane] = {
+            "queued": queued,
+            "started": started,
+            "deferred": int(totals.get("deferred", 0)),
+            "avg_wait": round(totals.get("wait_seconds", 0.0) / started, 3) if started else None,
+            "p50_wait": _percentile(samples, 0.5),
+            "p95_wait": _percentile(samples, 0.95),
+            "max_wait": samples[-1] if samples else None,
+        }
+    return stats
+
+
+class FairShareMixin:
+    """Worker behaviour for lane queues.
+
+    Before running a job tagged with a tenant (see ``enqueue_meta``) outside
+    the interactive lane, the worker claims one of the tenant's slots. A
+    tenant already running ``settings.bulk_tenant_max_running`` jobs or shards
+    has the job put back on its queue's schedule for
+    ``settings.bulk_tenant_defer_seconds``, which leaves the worker free for
+    other tenants. The job keeps its id, so shard dependencies still hold.
+    Each job that starts records how long it waited in its lane.
+    """
+
+    def execute_job(self, job: Job, queue: Queue):
+        lane = job.meta.get("lane") or queue.name
+        tenant = job.meta.get("tenant")
+        fair_share = tenant and lane != "interactive"
+        if fair_share:
+            ttl = job.timeout if job.timeout and job.timeout > 0 else settings.bulk_shard_timeout
+            if not acquire_tenant_slot(self.connection, tenant, job.id, ttl + 60):
+                self._defer(job, queue, lane)
+                return None
+
+        try:
+            queued_at = job.meta.get("queued_at")
+            queued_at = datetime.fromisoformat(queued_at) if queued_at else job.enqueued_at
+            if queued_at:
+                wait = max(0.0, (utcnow() - queued_at).total_seconds())
+                record_queue_latency(self.connection, lane, wait)
+                logger.info("bulk_queue_latency lane=%s job=%s seconds=%.3f", lane, job.id, wait)
+        except Exception as exc:
+            logger.warning("bulk_queue_metrics_failed lane=%s error=%s", lane, str(exc))
+
+        try:
+            return super().execute_job(job, queue)
+        finally:
+            if fair_share:
+                release_tenant_slot(self.connection, tenant, job.id)
+
+    def _defer(self, job: Job, queue: Queue, lane: str) -> None:
+        # Latency is measured from the first enqueue, not the last deferral.
+        if "queued_at" not in job.meta and job.enqueued_at:
+            job.meta["queued_at"] = job.enqueued_at.isoformat()
+        pipe = self.connection.pipeline()
+        job.set_status(JobStatus.SCHEDULED, pipeline=pipe)
+        queue.schedule_job(job, utcnow() + timedelta(seconds=settings.bulk_tenant_defer_seconds), pipeline=pipe)
+        pipe.execute()
+        record_deferral(self.connection, lane)
+        logger.info("bulk_job_deferred lane=%s job=%s tenant=%s", lane, job.id, job.meta.get("tenant"))
+
+
+class FairShareWorker(FairShareMixin, Worker):
+    pass
+
+
+class FairShareSimpleWorker(FairShareMixin, SimpleWorker):
+    pass
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import BulkJobResult, Page
+
+LOAD_BATCH = 5000
+DELETE_BATCH = 500
+
+
+class JobResultWriter:
+    """Buffers the per-row outcomes of a bulk job into multi-row inserts.
+
+    Rows are keyed by ``(job_id, row_number)`` (1-based CSV row), so a row
+    has exactly one result: the generated page or the error that stopped it.
+    Pages are recorded as ``uploading`` when their row is committed and become
+    ``completed`` once ``page_uploaded`` confirms the upload; together the
+    results double as the job's resume checkpoint (see ``load_checkpoint``).
+    """
+
+    def __init__(self, db: Session, job_id: str, batch_size: int | None = None):
+        self.db = db
+        self.job_id = job_id
+        self.batch_size = max(1, batch_size or settings.page_insert_batch_size)
+        self._pending: Dict[int, Dict] = {}
+        self._uploaded: List[int] = []
+
+    def _page_result(self, i: int, page: Dict, url: Optional[str]) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "row_number": i + 1,
+            "status": "uploading",
+            "page_id": page["id"],
+            "url": url,
+            "title": page["title"],
+            "slug": page["slug"],
+            "seo_score": page.get("seo_score"),
+        }
+
+    def add_page(self, i: int, page: Dict, url: Optional[str]) -> None:
+        self._add(self._page_result(i, page, url))
+
+    def insert_pages(self, pages: List[Tuple[int, Dict]]) -> None:
+        """Insert results for ``(row index, page row)`` pairs without committing.
+
+        Called inside the transaction that inserts the pages themselves, so a
+        committed page always has its result and resuming never regenerates it.
+        """
+        if pages:
+            self.db.execute(
+                insert(BulkJobResult),
+                [self._page_result(i, page, page["storage_url"]) for i, page in pages],
+            )
+
+    def add_error(self, i: int, error: str, row: Optional[Dict] = None) -> None:
+        self._add(
+            {
+                "row_number": i + 1,
+                "status": "failed",
+                "error": error,
+                "data": {str(k): str(v)[:100] for k, v in (row or {}).items()},
+            }
+        )
+
+    def page_uploaded(self, i: int) -> None:
+        pending = self._pending.get(i + 1)
+        if pending is not None:
+            pending["status"] = "completed"
+            return
+        self._uploaded.append(i + 1)
+        if len(self._uploaded) >= self.batch_size:
+            self.flush()
+
+    def _add(self, values: Dict) -> None:
+        self._pending[values["row_number"]] = {"job_id": self.job_id, **values}
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending and not self._uploaded:
+            return
+        rows, self._pending = list(self._pending.values()), {}
+        uploaded, self._uploaded = self._uploaded, []
+        if rows:
+            self.db.execute(insert(BulkJobResult), rows)
+        if uploaded:
+            self.db.execute(
+                update(BulkJobResult)
+                .where(BulkJobResult.job_id == self.job_id, BulkJobResult.row_number.in_(uploaded))
+                .values(status="completed")
+            )
+        self.db.commit()
+
+    def drop_pages(self, page_ids: Iterable[str]) -> None:
+        """Forget results of pages that were rolled back after the fact."""
+        self.flush()
+        page_ids = list(page_ids)
+        if page_ids:
+            self.db.query(BulkJobResult).filter(
+                BulkJobResult.job_id == self.job_id,
+                BulkJobResult.page_id.in_(page_ids),
+            ).delete(synchronize_session=False)
+
+
+class Checkpoint:
+    """Rows of a job, or of one shard's ``[start, end)`` range, that already have a final result.
+
+    Kept as one byte per row so resuming a large job stays cheap in memory.
+    """
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.processed = 0
+        self.failed = 0
+        # (page_id, url) of completed rows, for rebuilding the ZIP.
+        self.pages: List[Tuple[str, Optional[str]]] = []
+        # URLs of the unconfirmed pages that were deleted; their objects may exist.
+        self.discarded: List[str] = []
+        self._done = bytearray(max(0, end - start))
+
+    def __contains__(self, i: int) -> bool:
+        offset = i - self.start
+        return 0 <= offset < len(self._done) and bool(self._done[offset])
+
+    def __len__(self) -> int:
+        return self.processed + self.failed
+
+    def mark(self, i: int, status: str, page_id: Optional[str] = None, url: Optional[str] = None) -> None:
+        offset = i - self.start
+        if not 0 <= offset < len(self._done) or self._done[offset]:
+            return
+        self._done[offset] = 1
+        if status == "completed":
+            self.processed += 1
+            self.pages.append((page_id, url))
+        else:
+            self.failed += 1
+
+
+def load_checkpoint(db: Session, job_id: str, start: int, end: int) -> Checkpoint:
+    """Load what earlier attempts finished for rows ``[start, end)`` (0-based).
+
+    Pages whose upload was never confirmed (``uploading``) are deleted along
+    with their result, so those rows are generated again under the same slug.
+    Their URLs are left in ``Checkpoint.discarded`` for the caller to remove
+    whatever was uploaded.
+    """
+    checkpoint = Checkpoint(start, end)
+    stale: List[str] = []
+    query = (
+        db.query(BulkJobResult.row_number, BulkJobResult.status, BulkJobResult.page_id, BulkJobResult.url)
+        .filter(
+            BulkJobResult.job_id == job_id,
+            BulkJobResult.row_number > start,
+            BulkJobResult.row_number <= end,
+        )
+        .order_by(BulkJobResult.row_number)
+    )
+    for row_number, status, page_id, url in query.yield_per(LOAD_BATCH):
+        if status == "uploading":
+            stale.append(page_id)
+            if url:
+                checkpoint.discarded.append(url)
+        else:
+            checkpoint.mark(row_number - 1, status, page_id, url)
+
+    if stale:
+        for offset in range(0, len(stale), DELETE_BATCH):
+            batch = stale[offset:offset + DELETE_BATCH]
+            db.query(BulkJobResult).filter(
+                BulkJobResult.job_id == job_id,
+                BulkJobResult.page_id.in_(batch),
+            ).delete(synchronize_session=False)
+            db.query(Page).filter(Page.id.in_(batch)).delete(synchronize_session=False)
+        db.commit()
+    return checkpoint
+
+
+def clear_results(db: Session, job_id: str, start: int | None = None, end: int | None = None) -> None:
+    """Delete a job's results, optionally only for rows ``[start, end)`` (0-based)."""
+    query = db.query(BulkJobResult).filter(BulkJobResult.job_id == job_id)
+    if start is not None:
+        query = query.filter(BulkJobResult.row_number > start)
+    if end is not None:
+        query = query.filter(BulkJobResult.row_number <= end)
+    query.delete(synchronize_session=False)
+    db.commit()
+
+
+def iter_page_results(db: Session, job_id: str, batch: int = 1000) -> Iterable[Tuple[str, Optional[str]]]:
+    """Yield ``(page_id, url)`` of a job's generated pages in row order."""
+    query = (
+        db.query(BulkJobResult.page_id, BulkJobResult.url)
+        .filter(BulkJobResult.job_id == job_id, BulkJobResult.status == "completed")
+        .order_by(BulkJobResult.row_number)
+    )
+    for page_id, url in query.yield_per(batch):
+        yield page_id, url
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import BulkJob, Page, Template
+from app.services.ttl_cache import TTLCache
+
+JOB_STATUSES = ("queued", "processing", "completed", "completed_with_errors", "failed")
+
+# user_id -> dashboard stats. Workers change job and page counts all the
+# time without going through this process, so entries only live for
+# ``settings.job_stats_cache_ttl`` seconds; API writes drop them right away.
+stats_cache = TTLCache(settings.job_stats_cache_size)
+
+
+def compute_stats(db: Session, user_id: str) -> Dict:
+    """Job and page counts per status plus page aggregates and the template count.
+
+    One grouped query per table.
+    """
+    by_status = dict(
+        db.query(BulkJob.status, func.count(BulkJob.id))
+        .filter(BulkJob.user_id == user_id)
+        .group_by(BulkJob.status)
+        .all()
+    )
+    page_groups = (
+        db.query(
+            Page.status,
+            func.count(Page.id),
+            func.coalesce(func.sum(case((Page.is_bulk.is_(True), 1), else_=0)), 0),
+            func.sum(Page.seo_score),
+            func.count(Page.seo_score),
+        )
+        .filter(Page.user_id == user_id)
+        .group_by(Page.status)
+        .all()
+    )
+    scored = sum(group[4] for group in page_groups)
+    score_total = sum(float(group[3] or 0) for group in page_groups)
+    total_templates = db.query(func.count(Template.id)).filter(Template.user_id == user_id).scalar()
+    stats = {"total_jobs": sum(by_status.values()), "total_templates": total_templates}
+    stats.update({status: by_status.get(status, 0) for status in JOB_STATUSES})
+    stats.update(
+        total_pages=sum(group[1] for group in page_groups),
+        bulk_pages=sum(int(group[2]) for group in page_groups),
+        avg_seo_score=round(score_total / scored, 1) if scored else None,
+        page_statuses={group[0] or "unknown": group[1] for group in page_groups},
+    )
+    return stats
+
+
+def get_stats(db: Session, user_id: str) -> Dict:
+    found, stats = stats_cache.get(user_id)
+    if not found:
+        stats = compute_stats(db, user_id)
+        stats_cache.set(user_id, stats, settings.job_stats_cache_ttl)
+    return stats
+
+
+def invalidate_stats(user_id: str) -> None:
+    stats_cache.invalidate(user_id)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from html import unescape
+from typing import Dict
+import re
+
+from sqlalchemy import inspect, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models import Page
+
+# Body text indexed per page; the rest of a long page adds little to ranking.
+SEARCH_TEXT_MAX = 20_000
+BACKFILL_BATCH = 500
+
+_BODY_OPEN = re.compile(r"<body\b[^>]*>", re.IGNORECASE)
+_NON_TEXT = re.compile(r"<(script|style|template)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]*>")
+_TERM = re.compile(r"\w+")
+
+# SQLite: an FTS5 index over the pages table, kept in sync by triggers.
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE pages_fts USING fts5(
+        title, meta_description, slug, search_text,
+        content='pages', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pages_fts_insert AFTER INSERT ON pages BEGIN
+        INSERT INTO pages_fts(rowid, title, meta_description, slug, search_text)
+        VALUES (new.rowid, new.title, new.meta_description, new.slug, new.search_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pages_fts_delete AFTER DELETE ON pages BEGIN
+        INSERT INTO pages_fts(pages_fts, rowid, title, meta_description, slug, search_text)
+        VALUES ('delete', old.rowid, old.title, old.meta_description, old.slug, old.search_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS pages_fts_update
+    AFTER UPDATE OF title, meta_description, slug, search_text ON pages BEGIN
+        INSERT INTO pages_fts(pages_fts, rowid, title, meta_description, slug, search_text)
+        VALUES ('delete', old.rowid, old.title, old.meta_description, old.slug, old.search_text);
+        INSERT INTO pages_fts(rowid, title, meta_description, slug, search_text)
+        VALUES (new.rowid, new.title, new.meta_description, new.slug, new.search_text);
+    END
+    """,
+    # Index the rows written before the table existed.
+    "INSERT INTO pages_fts(pages_fts) VALUES ('rebuild')",
+]
+
+# Postgres: a weighted tsvector maintained by the database, with a GIN index.
+# Same statements as supabase/schema.sql.
+_POSTGRES_DDL = [
+    """
+    ALTER TABLE pages ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(meta_description, '')), 'B')
+        || setweight(to_tsvector('english', replace(coalesce(slug, ''), '-', ' ')), 'B')
+        || setweight(to_tsvector('english', coalesce(search_text, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_pages_search_vector ON pages USING GIN (search_vector)",
+]
+
+_SQLITE_SEARCH = text(
+    """
+    SELECT p.id, p.title, p.slug, p.meta_description, p.storage_url, p.seo_score, p.status,
+           p.created_at, p.updated_at, -bm25(pages_fts, 10.0, 5.0, 5.0, 1.0) AS rank
+    FROM pages_fts JOIN pages AS p ON p.rowid = pages_fts.rowid
+    WHERE pages_fts MATCH :query AND p.user_id = :user_id
+    ORDER BY bm25(pages_fts, 10.0, 5.0, 5.0, 1.0), p.created_at DESC, p.id DESC
+    LIMIT :limit OFFSET :skip
+    """
+)
+
+_POSTGRES_SEARCH = text(
+    """
+    SELECT p.id, p.title, p.slug, p.meta_description, p.storage_url, p.seo_score, p.status,
+           p.created_at, p.updated_at, ts_rank_cd(p.search_vector, q.query) AS rank
+    FROM pages AS p, websearch_to_tsquery('english', :query) AS q(query)
+    WHERE p.user_id = :user_id AND p.search_vector @@ q.query
+    ORDER BY rank DESC, p.created_at DESC, p.id DESC
+    LIMIT :limit OFFSET :skip
+    """
+)
+
+
+def search_text(html: str) -> str:
+    """Visible text of a page's body, whitespace-collapsed and capped at ``SEARCH_TEXT_MAX``.
+
+    A few regex passes rather than an HTML parse: this runs for every page
+    written, and a stray tag fragment in the index costs nothing.
+    """
+    html = html or ""
+    body = _BODY_OPEN.search(html)
+    if body:
+        html = html[body.end():]
+    html = _TAG.sub(" ", _NON_TEXT.sub(" ", html))
+    return " ".join(unescape(html).split())[:SEARCH_TEXT_MAX]
+
+
+def install_search_index(engine: Engine) -> None:
+    """Create the full-text index for the engine's dialect if it is missing."""
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            if inspect(conn).has_table("pages_fts"):
+                return
+            for statement in _SQLITE_DDL:
+                conn.execute(text(statement))
+        elif engine.dialect.name == "postgresql":
+            for statement in _POSTGRES_DDL:
+                conn.execute(text(statement))
+
+
+def backfill_search_text(db: Session, batch: int = BACKFILL_BATCH) -> int:
+    """Fill ``search_text`` for pages written before it existed; returns how many were updated.
+
+    Pages are read in id order ``batch`` at a time and each batch is written
+    back with one executemany and committed, so the run can be stopped and
+    started again. The index picks the new text up through its triggers
+    (SQLite) or the generated column (Postgres).
+    """
+    updated = 0
+    last_id = ""
+    while True:
+        rows = (
+            db.query(Page.id, Page.html_content)
+            .filter(Page.search_text.is_(None), Page.id > last_id)
+            .order_by(Page.id)
+            .limit(batch)
+            .all()
+        )
+        if not rows:
+            return updated
+        db.execute(update(Page), [{"id": page_id, "search_text": search_text(html)} for page_id, html in rows])
+        db.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
+
+
+def _fts5_query(query: str) -> str:
+    """All terms of ``query`` as quoted FTS5 strings, the last one as a prefix."""
+    terms = _TERM.findall(query)
+    if not terms:
+        return ""
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def search_pages(db: Session, user_id: str, query: str, skip: int, limit: int) -> Dict:
+    """Ranked page of ``user_id``'s pages matching every term of ``query``, best first."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        statement, query = _SQLITE_SEARCH, _fts5_query(query)
+    elif dialect == "postgresql":
+        statement, query = _POSTGRES_SEARCH, query.strip()
+    else:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
+    if not query:
+        return {"items": [], "next_skip": None}
+    items = (
+        db.execute(statement, {"query": query, "user_id": user_id, "limit": limit + 1, "skip": skip})
+        .mappings()
+        .all()
+    )
+    next_skip = skip + limit if len(items) > limit else None
+    return {"items": items[:limit], "next_skip": next_skip}
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from typing import Dict, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from slugify import slugify
+from urllib.parse import urlparse
 import uuid
 
+from app.config import settings
 from app.models import Page, Template
+from app.services.page_search import search_text
 from app.services.template_service import render_template
 from app.services.seo_service import evaluate_and_inject
 from app.services.storage_service import StorageService
-from app.utils.seo import word_count
+from app.services.uniqueness import UniquenessIndex
+from app.services.upload_pipeline import UploadPipeline
+from app.utils.seo import content_hash
 
 
 def build_slug(value: str) -> str:
@@ -18,6 +24,39 @@ def build_slug(value: str) -> str:
     return slug or "page"
 
 
+def pick_value(variables: Dict[str, str], keys: List[str]) -> Optional[str]:
+    for key in keys:
+        value = variables.get(key)
+        if value:
+            return str(value)
+    for k, v in variables.items():
+        if any(token in k.lower() for token in keys):
+            if v:
+                return str(v)
+    return None
+
+
+def bulk_row_fields(i: int, row: Dict[str, str]) -> Tuple[Dict[str, str], str, str, Optional[str]]:
+    """Variables, title, meta description and slug of row ``i`` (0-based) of a bulk CSV."""
+    variables = {str(k).strip(): v for k, v in (row or {}).items()}
+    title = pick_value(variables, ["title", "name"]) or f"Page {i + 1}"
+    meta_description = pick_value(variables, ["meta_description", "description"]) or title
+    return variables, title[:255], meta_description[:255], pick_value(variables, ["slug"])
+
+
+def storage_key_for(storage_url: str) -> str:
+    """Storage key of a page from its public URL.
+
+    Page keys are always ``{user_id}/{file}``, which is how every backend's
+    public URL ends.
+    """
+    return "/".join(urlparse(storage_url).path.split("/")[-2:])
+
+
+def robots_for(is_bulk: bool) -> str:
+    return "noindex, nofollow" if is_bulk else "index, follow"
+
+
 def generate_page(
     db: Session,
     template: Template,
@@ -28,13 +67,24 @@ def generate_page(
     slug: str | None,
     storage: StorageService,
     is_bulk: bool,
+    rendered: str | None = None,
+    uploads: UploadPipeline | None = None,
+    seo: Tuple[int, Dict, str] | None = None,
 ) -> Tuple[Page, str]:
-    rendered = render_template(template.html_content, variables)
+    """Render, post-process, upload and persist one page.
+
+    When ``uploads`` is given the upload is handed to the pipeline after the
+    row is committed instead of blocking here; the caller is responsible for
+    draining it and handling failed uploads. ``seo`` is an already computed
+    ``evaluate_and_inject`` result (see ``render_pool.render_row``).
+    """
+    if rendered is None and seo is None:
+        rendered = render_template(template.html_content, variables)
 
     base_slug = build_slug(slug or title)
     slug_value = base_slug
 
-    robots = "noindex, nofollow" if is_bulk else "index, follow"
+    robots = robots_for(is_bulk)
 
     for attempt in range(3):
         existing = (
@@ -48,17 +98,21 @@ def generate_page(
         key = f"{user_id}/{slug_value}-{uuid.uuid4().hex}.html"
         canonical_url = storage.get_public_url(key)
 
-        score, seo_data, html_with_meta = evaluate_and_inject(
-            rendered,
-            title=title,
-            meta_description=meta_description,
-            canonical_url=canonical_url,
-            robots=robots,
-        )
+        if seo is None:
+            score, seo_data, html_with_meta = evaluate_and_inject(
+                rendered,
+                title=title,
+                meta_description=meta_description,
+                canonical_url=canonical_url,
+                robots=robots,
+            )
+        else:
+            score, seo_data, html_with_meta = seo
 
-        storage.upload_html_with_key(key, html_with_meta)
+        if uploads is None:
+            storage.upload_html_with_key(key, html_with_meta)
         url = canonical_url
-        wc = word_count(html_with_meta)
+        wc = seo_data["word_count"]
 
         page = Page(
             user_id=user_id,
@@ -68,6 +122,9 @@ def generate_page(
             slug=slug_value,
             html_content=html_with_meta,
             storage_url=url,
+            search_text=search_text(html_with_meta),
+            variables=dict(variables),
+            render_hash=content_hash(html_with_meta),
             word_count=wc,
             seo_score=score,
             seo_data=seo_data,
@@ -78,6 +135,8 @@ def generate_page(
         try:
             db.commit()
             db.refresh(page)
+            if uploads is not None:
+                uploads.submit(key, html_with_meta)
             return page, url
         except IntegrityError:
             db.rollback()
@@ -85,3 +144,150 @@ def generate_page(
 
     # If we reach here, slug collisions are persistent.
     raise IntegrityError("Failed to persist page due to slug collisions.", params=None, orig=None)
+
+
+class PageBatchWriter:
+    """Persists bulk-generated pages in multi-row INSERTs.
+
+    ``add`` buffers an already rendered and post-processed page and, once
+    ``batch_size`` pages are buffered, writes them and returns their outcomes;
+    ``flush`` writes whatever is left. Slugs taken by existing pages are
+    looked up with one query per batch. If a batch still hits the
+    ``uq_user_slug`` constraint it is rolled back and only its rows are
+    retried one by one with random slug suffixes, like ``generate_page``.
+
+    Outcomes are ``(token, page, url, error)`` tuples in the order the pages
+    were added, where ``page`` is the inserted row as a dict (``None`` on
+    error). Uploads are handed to ``uploads`` once their row is committed.
+
+    With ``slugs``/``titles`` indexes (see ``UniquenessIndex``) slugs and
+    titles are allocated in memory instead: no lookup query per batch, and
+    duplicate titles get `` (n)`` suffixes like single pages do.
+
+    ``on_insert`` is called with the ``(token, row)`` pairs of every INSERT
+    right before its commit, so the caller can write rows that must land in
+    the same transaction as the pages (see ``JobResultWriter.insert_pages``).
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        storage: StorageService,
+        template: Template,
+        user_id: str,
+        is_bulk: bool,
+        uploads: UploadPipeline,
+        batch_size: int | None = None,
+        slugs: UniquenessIndex | None = None,
+        titles: UniquenessIndex | None = None,
+        on_insert: Callable[[List[Tuple[Any, Dict]]], None] | None = None,
+    ):
+        self.db = db
+        self.storage = storage
+        self.template = template
+        self.user_id = user_id
+        self.is_bulk = is_bulk
+        self.uploads = uploads
+        self.batch_size = max(1, batch_size or settings.page_insert_batch_size)
+        self.slugs = slugs
+        self.titles = titles
+        self.on_insert = on_insert
+        self._pending: List[Tuple[Any, Dict, str]] = []
+
+    def add(
+        self,
+        token: Any,
+        title: str,
+        meta_description: str,
+        slug: str | None,
+        seo: Tuple[int, Dict, str],
+        variables: Dict[str, str] | None = None,
+    ) -> List[Tuple[Any, Dict | None, str | None, str | None]]:
+        score, seo_data, html_with_meta = seo
+        base_slug = build_slug(slug or title)
+        if self.titles is not None:
+            title = self.titles.claim_title(title)
+        row = {
+            "id": str(uuid.uuid4()),
+            "user_id": self.user_id,
+            "template_id": self.template.id,
+            "title": title,
+            "meta_description": meta_description,
+            "slug": self.slugs.claim_slug(base_slug) if self.slugs is not None else base_slug,
+            "html_content": html_with_meta,
+            "storage_url": "",
+            "search_text": search_text(html_with_meta),
+            "variables": variables,
+            "render_hash": content_hash(html_with_meta),
+            "word_count": seo_data["word_count"],
+            "seo_score": score,
+            "seo_data": seo_data,
+            "status": "completed",
+            "is_bulk": self.is_bulk,
+        }
+        self._pending.append((token, row, base_slug))
+        if len(self._pending) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def _assign_key(self, row: Dict) -> str:
+        key = f"{self.user_id}/{row['slug']}-{uuid.uuid4().hex}.html"
+        row["storage_url"] = self.storage.get_public_url(key)
+        return key
+
+    def _taken_slugs(self, slugs: List[str]) -> set:
+        return {
+            slug
+            for (slug,) in self.db.query(Page.slug).filter(
+                Page.user_id == self.user_id,
+                Page.slug.in_(slugs),
+            )
+        }
+
+    def flush(self) -> List[Tuple[Any, Dict | None, str | None, str | None]]:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+
+        if self.slugs is None:
+            taken = self._taken_slugs(list({base for _, _, base in pending}))
+            for _, row, base in pending:
+                if row["slug"] in taken:
+                    row["slug"] = f"{base}-{uuid.uuid4().hex[:6]}"
+                taken.add(row["slug"])
+        keys = [self._assign_key(row) for _, row, _ in pending]
+
+        try:
+            self.db.execute(insert(Page), [row for _, row, _ in pending])
+            if self.on_insert is not None:
+                self.on_insert([(token, row) for token, row, _ in pending])
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            return [self._insert_one(token, row, base) for token, row, base in pending]
+
+        outcomes = []
+        for (token, row, _), key in zip(pending, keys):
+            self.uploads.submit(key, row["html_content"])
+            outcomes.append((token, row, row["storage_url"], None))
+        return outcomes
+
+    def _insert_one(self, token: Any, row: Dict, base: str) -> Tuple[Any, Dict | None, str | None, str | None]:
+        error = "Failed to persist page due to slug collisions."
+        for attempt in range(3):
+            key = self._assign_key(row)
+            try:
+                self.db.execute(insert(Page), [row])
+                if self.on_insert is not None:
+                    self.on_insert([(token, row)])
+                self.db.commit()
+            except IntegrityError as exc:
+                self.db.rollback()
+                error = str(exc.orig or exc)
+                row["slug"] = f"{base}-{uuid.uuid4().hex[:6]}"
+                if self.slugs is not None:
+                    row["slug"] = self.slugs.claim_slug(row["slug"])
+                continue
+            self.uploads.submit(key, row["html_content"])
+            return token, row, row["storage_url"], None
+        return token, None, None, error
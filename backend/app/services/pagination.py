@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+import base64
+import binascii
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Opaque cursor for the row a listing page ended on."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """``(created_at, id)`` from ``encode_cursor``; raises ``ValueError`` for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_page(
+    db: Session,
+    model,
+    columns: Sequence,
+    user_id: str,
+    cursor: Optional[str],
+    limit: int,
+) -> Dict:
+    """One page of ``user_id``'s rows of ``model``, newest first.
+
+    Only ``columns`` are selected, so wide columns (HTML, SEO data) stay in
+    the database. Rows are ordered by ``(created_at, id)`` descending and
+    the next page starts strictly after the last row returned, which the
+    ``(user_id, created_at, id)`` index serves without an offset scan.
+    """
+    query = db.query(*columns).filter(model.user_id == user_id)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < (created_at, row_id))
+    items = (
+        query.order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(items) > limit:
+        last = items[limit - 1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {"items": items[:limit], "next_cursor": next_cursor}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Tuple
+import multiprocessing
+
+from app.config import settings
+from app.services.seo_service import evaluate_and_inject
+from app.services.template_service import render_template, template_cache
+
+# (key, variables, title, meta_description) -> (key, (rendered, seo), error)
+RenderItem = Tuple[Any, Dict[str, str], str, str]
+RenderResult = Tuple[Any, Tuple[str, Tuple[int, Dict, str]] | None, str | None]
+
+
+def render_row(
+    html: str,
+    variables: Dict[str, str],
+    title: str,
+    meta_description: str,
+    robots: str,
+) -> Tuple[str, Tuple[int, Dict, str]]:
+    """Render a row and post-process it; the CPU-bound half of ``generate_page``.
+
+    Canonical tag injection is disabled, so the result does not depend on the
+    storage key the page ends up under.
+    """
+    rendered = render_template(html, variables)
+    return rendered, evaluate_and_inject(
+        rendered,
+        title=title,
+        meta_description=meta_description,
+        canonical_url="",
+        robots=robots,
+    )
+
+
+def _render_items(html: str, robots: str, items: List[RenderItem]) -> List[RenderResult]:
+    results: List[RenderResult] = []
+    for key, variables, title, meta_description in items:
+        try:
+            results.append((key, render_row(html, variables, title, meta_description, robots), None))
+        except Exception as exc:
+            results.append((key, None, str(exc)))
+    return results
+
+
+# Per-process state of pool workers, set once by the initializer.
+_worker_html = ""
+_worker_robots = ""
+
+
+def _init_worker(html: str, robots: str) -> None:
+    global _worker_html, _worker_robots
+    _worker_html = html
+    _worker_robots = robots
+    # Compile up front so every chunk only executes the template.
+    template_cache.get(html)
+
+
+def _render_chunk(items: List[RenderItem]) -> List[RenderResult]:
+    return _render_items(_worker_html, _worker_robots, items)
+
+
+class RenderPool:
+    """Renders rows of one template, optionally across worker processes.
+
+    With ``processes`` <= 1 rows are rendered inline. Otherwise chunks of
+    ``chunk_size`` rows are fanned out to warm processes that compiled the
+    template once at start-up, with a bounded number of chunks in flight so
+    the parent can keep persisting results while workers render ahead.
+    Results are yielded in input order.
+    """
+
+    def __init__(
+        self,
+        html: str,
+        robots: str,
+        processes: int | None = None,
+        chunk_size: int | None = None,
+    ):
+        self.html = html
+        self.robots = robots
+        self.processes = settings.render_processes if processes is None else processes
+        self.chunk_size = max(1, chunk_size or settings.render_chunk_size)
+        self._executor: ProcessPoolExecutor | None = None
+        if self.processes > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                # Bulk jobs run inside forked RQ work horses that already hold
+                # DB connections and upload threads; start clean interpreters.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(html, robots),
+            )
+
+    def __enter__(self) -> "RenderPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _chunks(self, items: Iterable[RenderItem]) -> Iterator[List[RenderItem]]:
+        chunk: List[RenderItem] = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def render(self, items: Iterable[RenderItem]) -> Iterator[RenderResult]:
+        if self._executor is None:
+            for item in items:
+                yield from _render_items(self.html, self.robots, [item])
+            return
+
+        pending: Deque[Future] = deque()
+        max_pending = self.processes * 2
+        for chunk in self._chunks(items):
+            pending.append(self._executor.submit(_render_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from app.utils.seo import validate_seo, inject_meta
+from app.utils.seo import postprocess_page
 
 
 def evaluate_and_inject(html: str, title: str, meta_description: str, canonical_url: str, robots: str):
-    score, details = validate_seo(html, title, meta_description)
-    updated = inject_meta(html, canonical_url=canonical_url, robots=robots)
-    return score, details, updated
+    # Canonical tag injection is disabled, so canonical_url is accepted but unused.
+    return postprocess_page(html, title, meta_description, robots)
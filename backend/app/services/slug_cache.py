@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Page
+from app.services.ttl_cache import TTLCache
+
+ROUTE_FIELDS = ("id", "slug", "storage_url", "status")
+
+# (user_id, slug) -> routing fields, or None for a slug that has no page.
+# Resolving a visitor's URL needs one indexed lookup, but the edge layer
+# does it for every request and the same few slugs are hit over and over.
+# Entries are dropped by ``invalidate_slug`` when this process creates or
+# deletes a page. Pages written elsewhere (bulk workers, other API
+# processes) are picked up when the entry expires, which is why misses are
+# kept for a much shorter TTL than hits.
+slug_cache = TTLCache(settings.slug_cache_size)
+
+
+def invalidate_slug(user_id: str, slug: str) -> None:
+    slug_cache.invalidate((user_id, slug))
+
+
+def resolve_slug(db: Session, user_id: str, slug: str) -> Optional[Dict]:
+    """Routing fields of the user's page with ``slug``, read through ``slug_cache``."""
+    found, route = slug_cache.get((user_id, slug))
+    if found:
+        return route
+    # Served by the uq_user_slug index; only the routing columns are read.
+    row = (
+        db.query(*(getattr(Page, field) for field in ROUTE_FIELDS))
+        .filter(Page.user_id == user_id, Page.slug == slug)
+        .first()
+    )
+    route = dict(row._mapping) if row is not None else None
+    ttl = settings.slug_cache_ttl if route is not None else settings.slug_cache_miss_ttl
+    slug_cache.set((user_id, slug), route, ttl)
+    return route
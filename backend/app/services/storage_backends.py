@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from supabase import Client
+
+from app.config import settings
+
+
+class StorageBackend(ABC):
+    """Object store used by ``StorageService``.
+
+    Keys are ``/``-separated paths such as ``<user_id>/<slug>-<hex>.html``.
+    Implementations raise ``ValueError`` when an operation fails.
+    """
+
+    @abstractmethod
+    def upload(self, key: str, data: bytes, content_type: str) -> None:
+        ...
+
+    def upload_many(self, items: Iterable[Tuple[str, bytes, str]]) -> None:
+        for key, data, content_type in items:
+            self.upload(key, data, content_type)
+
+    def upload_file(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        """Upload the rest of ``fileobj``; backends override this to avoid buffering it."""
+        self.upload(key, fileobj.read(), content_type)
+
+    @abstractmethod
+    def public_url(self, key: str) -> str:
+        ...
+
+    @abstractmethod
+    def download_to(self, key: str, fileobj: BinaryIO) -> None:
+        ...
+
+    def open_read(self, key: str) -> BinaryIO:
+        """Return a readable binary file for ``key``; the caller closes it."""
+        tmp = tempfile.TemporaryFile()
+        try:
+            self.download_to(key, tmp)
+        except Exception:
+            tmp.close()
+            raise
+        tmp.seek(0)
+        return tmp
+
+    @abstractmethod
+    def delete(self, keys: List[str]) -> None:
+        ...
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> List[str]:
+        ...
+
+
+def _raise_for_response(res) -> None:
+    # Supabase storage may return either a dict (older clients)
+    # or an httpx.Response (storage3). Handle both safely.
+    if isinstance(res, dict):
+        if res.get("error"):
+            raise ValueError(res["error"]["message"])
+        return
+
+    if hasattr(res, "is_success"):
+        if not res.is_success:
+            message = None
+            try:
+                payload = res.json()
+                if isinstance(payload, dict):
+                    message = payload.get("message") or payload.get("error")
+            except Exception:
+                message = None
+            if not message:
+                message = getattr(res, "text", None) or f"Upload failed with status {res.status_code}"
+            raise ValueError(message)
+
+
+class SupabaseStorageBackend(StorageBackend):
+    def __init__(self, supabase: Optional[Client], bucket: str):
+        self.supabase = supabase
+        self.bucket = bucket
+
+    def _bucket(self):
+        if not self.supabase:
+            raise ValueError("Supabase storage is not configured.")
+        return self.supabase.storage.from_(self.bucket)
+
+    def upload(self, key: str, data: bytes, content_type: str) -> None:
+        # Upsert so regenerated pages replace the object under their existing URL.
+        res = self._bucket().upload(key, data, {"content-type": content_type, "x-upsert": "true"})
+        _raise_for_response(res)
+
+    def upload_file(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        # storage3 streams uploads given a path, so spill to a named file first.
+        with tempfile.NamedTemporaryFile(suffix=Path(key).suffix) as tmp:
+            shutil.copyfileobj(fileobj, tmp)
+            tmp.flush()
+            # Upsert too: a resumed bulk job uploads its ZIP under the same key again.
+            res = self._bucket().upload(key, Path(tmp.name), {"content-type": content_type, "x-upsert": "true"})
+        _raise_for_response(res)
+
+    def public_url(self, key: str) -> str:
+        return self._bucket().get_public_url(key)
+
+    def download_to(self, key: str, fileobj: BinaryIO) -> None:
+        fileobj.write(self._bucket().download(key))
+
+    def delete(self, keys: List[str]) -> None:
+        if keys:
+            self._bucket().remove(keys)
+
+    def list(self, prefix: str = "") -> List[str]:
+        folder = prefix.rstrip("/")
+        entries = self._bucket().list(folder) or []
+        base = f"{folder}/" if folder else ""
+        return [f"{base}{entry['name']}" for entry in entries]
+
+
+class LocalStorageBackend(StorageBackend):
+    """Writes objects to a directory tree; handy for offline runs and load tests."""
+
+    def __init__(self, root: str, base_url: str | None = None):
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if path != self.root and self.root not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def upload(self, key: str, data: bytes, content_type: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".part")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def upload_file(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".part")
+        with tmp.open("wb") as out:
+            shutil.copyfileobj(fileobj, out)
+        tmp.replace(path)
+
+    def public_url(self, key: str) -> str:
+        if self.base_url:
+            return f"{self.base_url}/{key}"
+        return self._path(key).as_uri()
+
+    def download_to(self, key: str, fileobj: BinaryIO) -> None:
+        with self.open_read(key) as src:
+            shutil.copyfileobj(src, fileobj)
+
+    def open_read(self, key: str) -> BinaryIO:
+        try:
+            return self._path(key).open("rb")
+        except FileNotFoundError as exc:
+            raise ValueError(f"Object not found: {key}") from exc
+
+    def delete(self, keys: List[str]) -> None:
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    def list(self, prefix: str = "") -> List[str]:
+        return sorted(
+            path.relative_to(self.root).as_posix()
+            for path in self.root.rglob("*")
+            if path.is_file() and path.relative_to(self.root).as_posix().startswith(prefix)
+        )
+
+
+class MemoryStorageBackend(StorageBackend):
+    """In-memory fake with configurable per-request latency and failure rate."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        base_url: str = "memory://storage",
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.base_url = base_url.rstrip("/")
+        self.objects: Dict[str, Tuple[bytes, str]] = {}
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise ValueError("Injected storage failure")
+
+    def upload(self, key: str, data: bytes, content_type: str) -> None:
+        self._request()
+        with self._lock:
+            self.objects[key] = (data, content_type)
+
+    def upload_many(self, items: Iterable[Tuple[str, bytes, str]]) -> None:
+        # One simulated round-trip for the whole batch.
+        self._request()
+        with self._lock:
+            for key, data, content_type in items:
+                self.objects[key] = (data, content_type)
+
+    def public_url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def download_to(self, key: str, fileobj: BinaryIO) -> None:
+        self._request()
+        with self._lock:
+            if key not in self.objects:
+                raise ValueError(f"Object not found: {key}")
+            data = self.objects[key][0]
+        fileobj.write(data)
+
+    def delete(self, keys: List[str]) -> None:
+        self._request()
+        with self._lock:
+            for key in keys:
+                self.objects.pop(key, None)
+
+    def list(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            return sorted(key for key in self.objects if key.startswith(prefix))
+
+
+_memory_backends: Dict[str, MemoryStorageBackend] = {}
+
+
+def _memory_backend(name: str) -> MemoryStorageBackend:
+    # Shared per process so uploads stay visible across StorageService instances.
+    if name not in _memory_backends:
+        _memory_backends[name] = MemoryStorageBackend(
+            latency=settings.fake_storage_latency,
+            failure_rate=settings.fake_storage_failure_rate,
+        )
+    return _memory_backends[name]
+
+
+def get_storage_backend(supabase: Optional[Client]) -> StorageBackend:
+    """Build the backend selected by ``settings.storage_backend``."""
+    name = (settings.storage_backend or "supabase").lower()
+    if name == "supabase":
+        return SupabaseStorageBackend(supabase, settings.supabase_storage_bucket)
+    if name == "local":
+        return LocalStorageBackend(settings.local_storage_path, settings.local_storage_base_url)
+    if name == "memory":
+        return _memory_backend("pages")
+    raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
+
+
+def get_upload_backend(supabase: Optional[Client]) -> StorageBackend:
+    """Private store for uploaded CSVs, of the kind selected by ``settings.storage_backend``.
+
+    Generated pages are served from a public bucket; uploads hold customer
+    data, so they go to a bucket (or directory) with no public URL and are
+    only read back with the service credentials.
+    """
+    name = (settings.storage_backend or "supabase").lower()
+    if name == "supabase":
+        return SupabaseStorageBackend(supabase, settings.supabase_upload_bucket)
+    if name == "local":
+        return LocalStorageBackend(settings.local_upload_path)
+    if name == "memory":
+        return _memory_backend("uploads")
+    raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
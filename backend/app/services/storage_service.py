@@ -1,80 +1,51 @@
 from __future__ import annotations
 
 from supabase import Client
-from typing import Optional
+from typing import BinaryIO, Iterable, List, Optional, Tuple
 import uuid
 
 from app.config import settings
+from app.services.storage_backends import StorageBackend, get_storage_backend, get_upload_backend
 
 
 class StorageService:
-    def __init__(self, supabase: Optional[Client]):
+    def __init__(self, supabase: Optional[Client], backend: StorageBackend | None = None):
         self.supabase = supabase
         self.bucket = settings.supabase_storage_bucket
+        self.backend = backend or get_storage_backend(supabase)
 
     def get_public_url(self, key: str) -> str:
-        if not self.supabase:
-            raise ValueError("Supabase storage is not configured.")
-        return self.supabase.storage.from_(self.bucket).get_public_url(key)
+        return self.backend.public_url(key)
 
     def upload_html_with_key(self, key: str, html: str) -> None:
-        if not self.supabase:
-            raise ValueError("Supabase storage is not configured.")
-
-        res = self.supabase.storage.from_(self.bucket).upload(
-            key,
-            html.encode("utf-8"),
-            {"content-type": "text/html"},
-        )
-        # Supabase storage upload may return either a dict (older clients)
-        # or an httpx.Response (storage3). Handle both safely.
-        if isinstance(res, dict):
-            if res.get("error"):
-                raise ValueError(res["error"]["message"])
-            return
-
-        if hasattr(res, "is_success"):
-            if not res.is_success:
-                message = None
-                try:
-                    payload = res.json()
-                    if isinstance(payload, dict):
-                        message = payload.get("message") or payload.get("error")
-                except Exception:
-                    message = None
-                if not message:
-                    message = getattr(res, "text", None) or f"Upload failed with status {res.status_code}"
-                raise ValueError(message)
-            return
+        self.backend.upload(key, html.encode("utf-8"), "text/html")
 
     def upload_html(self, user_id: str, html: str, slug: str) -> str:
         key = f"{user_id}/{slug}-{uuid.uuid4().hex}.html"
         self.upload_html_with_key(key, html)
         return self.get_public_url(key)
 
+    def upload_html_batch(self, pages: Iterable[Tuple[str, str]]) -> None:
+        self.backend.upload_many(
+            (key, html.encode("utf-8"), "text/html") for key, html in pages
+        )
+
     def upload_bytes_with_key(self, key: str, data: bytes, content_type: str) -> None:
-        if not self.supabase:
-            raise ValueError("Supabase storage is not configured.")
+        self.backend.upload(key, data, content_type)
+
+    def upload_file_with_key(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        self.backend.upload_file(key, fileobj, content_type)
+
+    def open_read(self, key: str) -> BinaryIO:
+        return self.backend.open_read(key)
+
+    def delete(self, keys: List[str]) -> None:
+        self.backend.delete(keys)
+
+    def list(self, prefix: str = "") -> List[str]:
+        return self.backend.list(prefix)
 
-        res = self.supabase.storage.from_(self.bucket).upload(
-            key,
-            data,
-            {"content-type": content_type},
-        )
-        if isinstance(res, dict):
-            if res.get("error"):
-                raise ValueError(res["error"]["message"])
-            return
 
-        if hasattr(res, "is_success"):
-            if not res.is_success:
-                message = None
-                try:
-                    payload = res.json()
-                    if isinstance(payload, dict):
-                        message = payload.get("message") or payload.get("error")
-                except Exception:
-                    message = None
-                if not message:
-                    message = getattr(res, "text", None) or f"Upload failed with status {res.status_code}"
-                raise ValueError(message)
+def upload_storage(supabase: Optional[Client]) -> StorageService:
+    """``StorageService`` over the private upload store (see ``get_upload_backend``)."""
+    return StorageService(supabase, get_upload_backend(supabase))
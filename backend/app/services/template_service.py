@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from typing import Dict, List
 from jinja2 import Template, TemplateSyntaxError
 from bs4 import BeautifulSoup
 import bleach
+import threading
 
+from app.config import settings
+from app.utils.seo import content_hash
 from app.utils.template_parser import extract_variables
 
 
@@ -76,9 +80,64 @@ def _build_template_error_context(html: str, line_no: int, radius: int = 2) -> s
     return "\n".join(context)
 
 
+class TemplateCache:
+    """Bounded LRU of compiled Jinja templates keyed by a hash of the source.
+
+    Compiling is by far the most expensive part of rendering, so bulk jobs that
+    render the same template for every row only pay for it once.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = max(1, maxsize)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Template]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, html: str) -> Template:
+        key = content_hash(html or "")
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent miss on the same key just
+        # compiles twice and the last writer wins.
+        compiled = Template(html)
+
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+template_cache = TemplateCache(settings.template_cache_size)
+
+
 def render_template(html: str, variables: Dict[str, str]) -> str:
     try:
-        template = Template(html)
+        template = template_cache.get(html)
         return template.render(**variables)
     except TemplateSyntaxError as exc:
         context = _build_template_error_context(html, exc.lineno or 0)
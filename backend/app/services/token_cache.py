@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+import hashlib
+import threading
+import time
+
+from jose import jwt, JWTError
+
+from app.config import settings
+from app.services.ttl_cache import TTLCache
+
+# sha256(token) -> the user dict ``get_current_user`` returns. Tokens
+# themselves are never kept. An entry lives until the token's ``exp``, and
+# never longer than ``settings.auth_cache_max_ttl``: that bound is how long
+# a session revoked on the Supabase side can still be used here.
+token_cache = TTLCache(settings.auth_cache_size)
+
+_counters = {"local_verifications": 0, "remote_verifications": 0, "rejected": 0}
+_counters_lock = threading.Lock()
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def count(name: str) -> None:
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def token_ttl(token: str, claims: Optional[Dict] = None) -> float:
+    """Seconds ``token`` may stay cached: up to its ``exp``, capped by ``auth_cache_max_ttl``.
+
+    ``claims`` are the verified claims when the caller has them; otherwise
+    ``exp`` is read without verification, which is safe because the token
+    was verified remotely and ``exp`` only ever shortens the lifetime.
+    """
+    if claims is None:
+        try:
+            claims = jwt.get_unverified_claims(token)
+        except JWTError:
+            claims = {}
+    ttl = float(settings.auth_cache_max_ttl)
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - time.time())
+    return ttl
+
+
+def auth_stats() -> Dict[str, int]:
+    with _counters_lock:
+        counters = dict(_counters)
+    return {**token_cache.stats(), **counters}
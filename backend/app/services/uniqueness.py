@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+import hashlib
+import uuid
+
+from app.models import Page
+
+TITLE_MAX = 255
+LOAD_BATCH = 5000
+
+
+def _fingerprint(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class Reservations:
+    """One user's claimed values of a column, shared by every worker through a Redis hash.
+
+    Each ``UniquenessIndex`` is a snapshot loaded by one process, so shards of
+    a job (or jobs of the same user) running at once cannot see each other's
+    claims in it. Every claim is also recorded here with HSETNX under
+    ``owner``; a value recorded by another owner counts as taken. The owner
+    is stable across retries of the same shard, so a retry can take back the
+    values its earlier attempt claimed. The hash expires ``ttl`` seconds
+    after the user's last claim, by when those pages are committed and in
+    every newly loaded snapshot.
+    """
+
+    def __init__(self, redis, user_id: str, column: str, owner: str, ttl: int):
+        self.redis = redis
+        self.key = f"uniqueness:{user_id}:{column}"
+        self.owner = owner
+        self.ttl = ttl
+
+    def reserve(self, value: str) -> bool:
+        """Record ``value`` for ``owner``; False if another owner already holds it."""
+        field = _fingerprint(value)
+        pipe = self.redis.pipeline()
+        pipe.hsetnx(self.key, field, self.owner)
+        pipe.hget(self.key, field)
+        pipe.expire(self.key, self.ttl)
+        _, holder, _ = pipe.execute()
+        if isinstance(holder, bytes):
+            holder = holder.decode("utf-8")
+        return holder == self.owner
+
+
+class UniquenessIndex:
+    """In-memory set of a user's taken slugs or titles.
+
+    Values are stored as 64-bit hashes to keep per-entry memory small for
+    users with hundreds of thousands of pages. A hash collision can only make
+    a free value look taken, which costs a suffix, never a duplicate. Values
+    handed out by ``claim_slug``/``claim_title`` are added immediately, so
+    duplicates within one CSV are resolved without touching the database;
+    ``reservations`` extends that to values other workers claim meanwhile.
+    """
+
+    def __init__(self, values: Iterable[str] = (), reservations: Reservations | None = None):
+        self._taken = {_fingerprint(value) for value in values if value is not None}
+        self._next_suffix: Dict[str, int] = {}
+        self.reservations = reservations
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        column,
+        user_id: str,
+        prefix: str | None = None,
+        reservations: Reservations | None = None,
+    ) -> "UniquenessIndex":
+        """Load ``column`` (``Page.slug`` or ``Page.title``) for a user in one query.
+
+        With ``prefix`` only ``prefix`` itself and its `` (n)`` variants are
+        loaded, which is all ``claim_title(prefix)`` needs. With
+        ``reservations`` claims are also checked against other workers'.
+        """
+        query = db.query(column).filter(Page.user_id == user_id)
+        if prefix is not None:
+            query = query.filter(
+                or_(column == prefix, column.like(f"{_escape_like(prefix)} (%)", escape="\\"))
+            )
+        return cls((value for (value,) in query.yield_per(LOAD_BATCH)), reservations)
+
+    def __contains__(self, value: str) -> bool:
+        return _fingerprint(value) in self._taken
+
+    def __len__(self) -> int:
+        return len(self._taken)
+
+    def add(self, value: str) -> None:
+        self._taken.add(_fingerprint(value))
+
+    def _taken_elsewhere(self, value: str) -> bool:
+        if self.reservations is None or self.reservations.reserve(value):
+            return False
+        self.add(value)
+        return True
+
+    def claim_slug(self, base: str) -> str:
+        slug = base
+        while slug in self or self._taken_elsewhere(slug):
+            slug = f"{base}-{uuid.uuid4().hex[:6]}"
+        self.add(slug)
+        return slug
+
+    def claim_title(self, base: str) -> str:
+        """Return ``base`` or the first free ``base (n)``, n >= 2."""
+        title = base
+        suffix = self._next_suffix.get(base, 2)
+        while title in self or self._taken_elsewhere(title):
+            label = f" ({suffix})"
+            title = f"{base[:TITLE_MAX - len(label)]}{label}"
+            suffix += 1
+        self._next_suffix[base] = suffix
+        self.add(title)
+        return title
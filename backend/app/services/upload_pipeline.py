@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List
+import logging
+import threading
+import time
+
+from app.config import settings
+from app.services.storage_service import StorageService
+
+logger = logging.getLogger("app.uploads")
+
+
+class UploadPipeline:
+    """Uploads rendered pages in the background while the caller keeps rendering.
+
+    ``submit`` blocks once ``max_in_flight`` uploads are pending, so a slow
+    storage backend applies backpressure instead of letting rendered pages pile
+    up in memory. Failed uploads are retried with exponential backoff, and
+    ``drain`` returns one outcome per submission in submission order. Callers
+    that act on outcomes as they happen can take them from ``ready`` first;
+    ``drain`` then returns only the rest.
+    """
+
+    def __init__(
+        self,
+        storage: StorageService,
+        max_in_flight: int | None = None,
+        max_retries: int | None = None,
+        backoff: float | None = None,
+    ):
+        self.storage = storage
+        self.max_in_flight = max(1, max_in_flight or settings.upload_max_in_flight)
+        self.max_retries = settings.upload_max_retries if max_retries is None else max_retries
+        self.backoff = settings.upload_retry_backoff if backoff is None else backoff
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight,
+            thread_name_prefix="upload",
+        )
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._keys: List[str] = []
+        self._futures: List[Future] = []
+        self._returned = 0
+
+    def __enter__(self) -> "UploadPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def submit(self, key: str, html: str) -> int:
+        """Queue an upload and return its position in the ``drain`` results."""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._upload, key, html)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._keys.append(key)
+        self._futures.append(future)
+        return len(self._futures) - 1
+
+    def _upload(self, key: str, html: str) -> int:
+        delay = self.backoff
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                self.storage.upload_html_with_key(key, html)
+                return attempt
+            except Exception as exc:
+                if attempt > self.max_retries:
+                    raise
+                logger.warning("upload_retry key=%s attempt=%s error=%s", key, attempt, str(exc))
+                time.sleep(delay)
+                delay *= 2
+        return attempt
+
+    def _outcome(self, index: int) -> Dict:
+        future = self._futures[index]
+        exc = future.exception()
+        return {
+            "key": self._keys[index],
+            "error": str(exc) if exc else None,
+            "attempts": future.result() if not exc else self.max_retries + 1,
+        }
+
+    def ready(self) -> Iterator[Dict]:
+        """Yield outcomes of finished uploads not returned yet, in order, without blocking.
+
+        Stops at the first upload that is still in flight.
+        """
+        while self._returned < len(self._futures) and self._futures[self._returned].done():
+            self._returned += 1
+            yield self._outcome(self._returned - 1)
+
+    def drain(self) -> List[Dict]:
+        """Wait for every submitted upload and return the outcomes not returned yet, in order."""
+        wait(self._futures[self._returned:])
+        self._executor.shutdown(wait=True)
+        outcomes = [self._outcome(index) for index in range(self._returned, len(self._futures))]
+        self._returned = len(self._futures)
+        return outcomes
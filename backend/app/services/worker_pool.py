@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Tuple
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+from redis import Redis
+from rq.job import Job
+from rq.queue import Queue
+from rq.timeouts import TimerDeathPenalty
+from sqlalchemy import text
+
+from app.config import settings
+from app.services.job_queue import FairShareSimpleWorker, lane_queues
+
+logger = logging.getLogger("app.worker")
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes, or 0 where it can't be read."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current RSS, which is close enough for recycling.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class WarmWorker(FairShareSimpleWorker):
+    """Runs jobs in its own long-lived process instead of forking one per job.
+
+    Module-level state survives from one job to the next: compiled templates,
+    the SQLAlchemy connection pool, the Supabase client and its HTTP session.
+    To bound memory growth the worker stops once its RSS passes ``max_rss``
+    bytes (and after ``max_jobs`` when started with ``work(max_jobs=...)``);
+    ``WorkerPool`` then starts a fresh process in its place.
+    """
+
+    def __init__(self, *args, max_rss: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_rss = max_rss
+
+    def execute_job(self, job: Job, queue: Queue):
+        try:
+            return super().execute_job(job, queue)
+        finally:
+            rss = current_rss()
+            if self.max_rss and rss > self.max_rss:
+                logger.info("worker_recycle reason=rss pid=%s rss_mb=%s", os.getpid(), rss // (1024 * 1024))
+                # Checked by RQ before it dequeues the next job.
+                self._stop_requested = True
+
+
+def warm_up(preload: Iterable[str] = ()) -> None:
+    """Import job modules and open a database connection ahead of the first job."""
+    from app.dependencies import engine
+
+    # A forked child must not reuse connections it inherited from the parent.
+    engine.dispose(close=False)
+    for module in preload:
+        importlib.import_module(module)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def run_warm_worker(redis_url: str, preload: Tuple[str, ...] = ()) -> None:
+    """Entry point of one pool process."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    warm_up(preload)
+    connection = Redis.from_url(redis_url)
+    worker = WarmWorker(
+        lane_queues(connection),
+        connection=connection,
+        max_rss=settings.worker_max_rss_mb * 1024 * 1024,
+    )
+    if os.name == "nt":
+        # Windows doesn't support SIGALRM; use TimerDeathPenalty instead.
+        worker.death_penalty_class = TimerDeathPenalty
+    # Every process runs a scheduler; RQ's queue locks leave one of them active.
+    worker.work(with_scheduler=True, max_jobs=settings.worker_max_jobs or None)
+
+
+class WorkerPool:
+    """Keeps ``processes`` warm workers running, starting a new one whenever one exits.
+
+    Workers exit when they are recycled, crash or are stopped. SIGTERM and
+    SIGINT are passed on to the workers, which finish their current job
+    first (RQ's warm shutdown).
+    """
+
+    def __init__(self, processes: int, redis_url: str, preload: Tuple[str, ...] = ()):
+        self.processes = max(1, processes)
+        self.args = (redis_url, preload)
+        self._workers: List[Optional[multiprocessing.Process]] = [None] * self.processes
+        self._stopping = False
+
+    def _start(self, slot: int) -> None:
+        process = multiprocessing.Process(target=run_warm_worker, args=self.args, name=f"warm-worker-{slot}")
+        process.start()
+        self._workers[slot] = process
+        logger.info("worker_started slot=%s pid=%s", slot, process.pid)
+
+    def _stop(self, signum, frame) -> None:
+        self._stopping = True
+        for process in self._workers:
+            if process is not None and process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for slot in range(self.processes):
+            self._start(slot)
+        try:
+            while not self._stopping:
+                for slot, process in enumerate(self._workers):
+                    if process is not None and not process.is_alive() and not self._stopping:
+                        logger.info("worker_exited slot=%s pid=%s code=%s", slot, process.pid, process.exitcode)
+                        self._start(slot)
+                time.sleep(1)
+        finally:
+            for process in self._workers:
+                if process is not None:
+                    process.join()
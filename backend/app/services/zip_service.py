@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from tempfile import SpooledTemporaryFile
+from typing import List, Optional
+import shutil
+import zipfile
+
+from app.config import settings
+from app.services.storage_service import StorageService
+
+
+class BulkZipWriter:
+    """Assembles a bulk job's download as pages complete.
+
+    Pages are compressed straight into a spooled temp file that rolls over to
+    disk past ``spool_size`` bytes, and their URLs go to a second spooled
+    file, so memory stays flat however large the job is. With ``part_size``
+    set, a new archive is started once the current one reaches that many
+    compressed bytes; ``urls.txt`` goes into the last part. ``upload`` streams
+    every part to storage from disk.
+    """
+
+    def __init__(self, part_size: int | None = None, spool_size: int | None = None):
+        self.part_size = settings.bulk_zip_part_size if part_size is None else part_size
+        self.spool_size = settings.bulk_zip_spool_size if spool_size is None else spool_size
+        self.entries = 0
+        self._parts: List[SpooledTemporaryFile] = []
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._urls = SpooledTemporaryFile(max_size=self.spool_size)
+
+    def __enter__(self) -> "BulkZipWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _start_part(self) -> zipfile.ZipFile:
+        part = SpooledTemporaryFile(max_size=self.spool_size)
+        self._parts.append(part)
+        self._zip = zipfile.ZipFile(part, "w", compression=zipfile.ZIP_DEFLATED)
+        return self._zip
+
+    def add(self, filename: str, html: str, url: Optional[str] = None) -> None:
+        zf = self._zip or self._start_part()
+        zf.writestr(filename, html)
+        self.entries += 1
+        if url:
+            self._urls.write((b"\n" if self._urls.tell() else b"") + url.encode("utf-8"))
+        if self.part_size and self._parts[-1].tell() >= self.part_size:
+            zf.close()
+            self._zip = None
+
+    def upload(self, storage: StorageService, key_prefix: str) -> List[str]:
+        """Finish the archive(s) and upload them; returns their public URLs in order.
+
+        A single archive is stored as ``{key_prefix}.zip``, split ones as
+        ``{key_prefix}-part1.zip``, ``-part2.zip``, and so on.
+        """
+        if not self.entries:
+            return []
+        zf = self._zip or zipfile.ZipFile(self._parts[-1], "a", compression=zipfile.ZIP_DEFLATED)
+        self._urls.seek(0)
+        with zf.open("urls.txt", "w") as dst:
+            shutil.copyfileobj(self._urls, dst)
+        zf.close()
+        self._zip = None
+
+        urls = []
+        for number, part in enumerate(self._parts, start=1):
+            key = f"{key_prefix}.zip" if len(self._parts) == 1 else f"{key_prefix}-part{number}.zip"
+            part.seek(0)
+            storage.upload_file_with_key(key, part, "application/zip")
+            urls.append(storage.get_public_url(key))
+        return urls
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        for part in self._parts:
+            part.close()
+        self._parts = []
+        self._urls.close()
+
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from bs4 import BeautifulSoup
+from html import escape
+from html.parser import HTMLParser
 from typing import Tuple, List, Dict
 import hashlib
 import re
@@ -18,10 +20,15 @@ def strip_text(html: str) -> str:
     return soup.get_text(" ")
 
 
+WORD_PATTERN = re.compile(r"\b\w+\b")
+
+# Elements whose text BeautifulSoup's get_text() leaves out.
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+
 def word_count(html: str) -> int:
-    text = strip_text(html)
-    words = re.findall(r"\b\w+\b", text)
-    return len(words)
+    scanner = _PageScanner(html)
+    return scanner.words
 
 
 def content_hash(text: str) -> str:
@@ -29,11 +36,14 @@ def content_hash(text: str) -> str:
 
 
 def validate_seo(html: str, title: str, meta_description: str) -> Tuple[int, Dict]:
+    return _score_seo(word_count(html), title, meta_description)
+
+
+def _score_seo(wc: int, title: str, meta_description: str) -> Tuple[int, Dict]:
     issues: List[str] = []
     warnings: List[str] = []
     suggestions: List[str] = []
 
-    wc = word_count(html)
     # SEO checks are informational only; do not enforce content length or meta bounds.
 
     score = 100
@@ -70,3 +80,122 @@ def inject_meta(html: str, canonical_url: str, robots: str) -> str:
             soup.head.append(tag)
 
     return str(soup)
+
+
+class _PageScanner(HTMLParser):
+    """One tokenizer pass collecting everything post-processing needs.
+
+    Counts words with the same rules as ``word_count`` and records the source
+    offsets where a robots meta tag has to be inserted or replaced, so the
+    output can be produced by splicing the original string instead of
+    re-serializing a parse tree.
+    """
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.html = html or ""
+        self.words = 0
+        self.html_open_end: int | None = None
+        self.head_open_end: int | None = None
+        self.head_close_start: int | None = None
+        self.robots_span: Tuple[int, int] | None = None
+        self.robots_attrs: List[Tuple[str, str | None]] = []
+        self._skip_depth = 0
+        self._in_head = False
+        self._line_offsets = [0]
+        for match in re.finditer("\n", self.html):
+            self._line_offsets.append(match.end())
+        self.feed(self.html)
+        self.close()
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self._line_offsets[line - 1] + col
+
+    def _tag_span(self) -> Tuple[int, int]:
+        start = self._offset()
+        return start, start + len(self.get_starttag_text() or "")
+
+    def handle_starttag(self, tag, attrs):
+        if tag in NON_TEXT_TAGS:
+            self._skip_depth += 1
+        elif tag == "html" and self.html_open_end is None:
+            self.html_open_end = self._tag_span()[1]
+        elif tag == "head" and self.head_open_end is None:
+            self.head_open_end = self._tag_span()[1]
+            self._in_head = True
+        elif tag == "meta" and self._in_head and self.robots_span is None:
+            if dict(attrs).get("name") == "robots":
+                self.robots_span = self._tag_span()
+                self.robots_attrs = attrs
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in NON_TEXT_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in NON_TEXT_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "head" and self._in_head:
+            self.head_close_start = self._offset()
+            self._in_head = False
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.words += len(WORD_PATTERN.findall(data))
+
+    def unknown_decl(self, data):
+        if data.startswith("CDATA[") and not self._skip_depth:
+            self.words += len(WORD_PATTERN.findall(data[6:]))
+
+
+def _meta_tag(attrs: List[Tuple[str, str | None]]) -> str:
+    parts = []
+    for name, value in attrs:
+        if value is None:
+            parts.append(name)
+        else:
+            parts.append(f'{name}="{escape(value, quote=True)}"')
+    return f"<meta {' '.join(parts)}/>"
+
+
+def _splice_robots(scanner: _PageScanner, robots: str) -> str:
+    html = scanner.html
+    if not robots:
+        return html
+
+    if scanner.robots_span:
+        attrs = [(k, v) for k, v in scanner.robots_attrs if k != "content"]
+        attrs.append(("content", robots))
+        start, end = scanner.robots_span
+        return html[:start] + _meta_tag(attrs) + html[end:]
+
+    tag = _meta_tag([("name", "robots"), ("content", robots)])
+    if scanner.head_open_end is not None:
+        at = scanner.head_close_start
+        if at is None:
+            at = scanner.head_open_end
+        return html[:at] + tag + html[at:]
+    if scanner.html_open_end is not None:
+        at = scanner.html_open_end
+        return html[:at] + f"<head>{tag}</head>" + html[at:]
+    return f"<head>{tag}</head>" + html
+
+
+def postprocess_page(
+    html: str,
+    title: str,
+    meta_description: str,
+    robots: str,
+) -> Tuple[int, Dict, str]:
+    """Score a rendered page and inject its robots meta in a single parse.
+
+    Returns the same ``(score, seo_data, html)`` triple as running
+    ``validate_seo`` followed by ``inject_meta``. The injected tag carries no
+    text, so ``seo_data["word_count"]`` also holds for the returned HTML.
+    Unlike ``inject_meta`` the rest of the markup is kept byte-for-byte.
+    """
+    scanner = _PageScanner(html)
+    score, seo_data = _score_seo(scanner.words, title, meta_description)
+    return score, seo_data, _splice_robots(scanner, robots)
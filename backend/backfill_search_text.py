@@ -0,0 +1,18 @@
+#!/usr/bin/env python
+"""Fill pages.search_text for pages created before full-text search existed."""
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.dependencies import SessionLocal
+from app.services.page_search import backfill_search_text
+
+db = SessionLocal()
+try:
+    updated = backfill_search_text(db)
+    print(f'✓ Backfilled search text for {updated} pages')
+except Exception as e:
+    print(f'✗ Error backfilling search text: {e}')
+    sys.exit(1)
+finally:
+    db.close()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Per-page CPU time of SEO post-processing: legacy BeautifulSoup path vs single pass.
+
+Usage (from backend/):
+    python benchmarks/bench_postprocess.py [--pages 200] [--sections 50 200 1000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.utils.seo import inject_meta, postprocess_page, validate_seo, word_count  # noqa: E402
+
+
+def build_page(sections: int) -> str:
+    body = "".join(
+        f"<section><h2>Section {i}</h2><p>Lorem ipsum dolor sit amet, consectetur "
+        f"adipiscing elit &amp; sed do eiusmod tempor {i}.</p>"
+        f"<ul><li>One</li><li>Two</li><li><a href='/x/{i}'>Three</a></li></ul></section>"
+        for i in range(sections)
+    )
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><title>Benchmark page</title>"
+        "<meta name=\"description\" content=\"desc\"><style>p{margin:0}</style></head>"
+        f"<body><main>{body}</main><script>var a = 1;</script></body></html>"
+    )
+
+
+def legacy(html: str) -> int:
+    score, seo_data = validate_seo(html, "title", "description")
+    updated = inject_meta(html, canonical_url="", robots="noindex, nofollow")
+    return word_count(updated)
+
+
+def single_pass(html: str) -> int:
+    score, seo_data, updated = postprocess_page(html, "title", "description", "noindex, nofollow")
+    return seo_data["word_count"]
+
+
+def measure(fn, html: str, pages: int) -> float:
+    start = time.process_time()
+    for _ in range(pages):
+        fn(html)
+    return (time.process_time() - start) / pages * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--sections", type=int, nargs="+", default=[50, 200, 1000])
+    args = parser.parse_args()
+
+    print(f"{'sections':>8} {'bytes':>9} {'legacy ms':>10} {'single ms':>10} {'speedup':>8}")
+    for sections in args.sections:
+        html = build_page(sections)
+        # Legacy parses with BeautifulSoup while the engine tokenizes once; make
+        # sure they agree before timing anything.
+        assert legacy(html) == single_pass(html)
+        pages = max(1, args.pages * 50 // sections)
+        before = measure(legacy, html, pages)
+        after = measure(single_pass, html, pages)
+        print(f"{sections:>8} {len(html):>9} {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Rows/sec of the bulk render stage (Jinja render + SEO post-processing).
+
+processes=1 is the inline loop bulk jobs have always used; higher counts fan
+chunks out to RenderPool worker processes.
+
+Usage (from backend/):
+    python benchmarks/bench_render_pool.py [--rows 2000] [--processes 1 2 4 8] [--chunk-size 50]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.render_pool import RenderPool  # noqa: E402
+
+
+TEMPLATE = (
+    "<!DOCTYPE html><html><head><title>{{ title }}</title>"
+    "<meta name=\"description\" content=\"{{ description }}\"></head><body><main>"
+    "{% for i in range(120) %}<section><h2>{{ city }} guide part {{ i }}</h2>"
+    "<p>Everything about {{ service }} in {{ city }}, {{ state }} &amp; nearby areas.</p>"
+    "</section>{% endfor %}</main></body></html>"
+)
+
+
+def rows(count: int):
+    for i in range(count):
+        variables = {
+            "title": f"Plumbers in City {i}",
+            "description": f"Find the best plumbers in City {i}",
+            "city": f"City {i}",
+            "state": "CA",
+            "service": "plumbing",
+        }
+        yield i, variables, variables["title"], variables["description"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=50)
+    args = parser.parse_args()
+
+    baseline = None
+    for processes in sorted(set(args.processes)):
+        with RenderPool(TEMPLATE, "noindex, nofollow", processes=processes, chunk_size=args.chunk_size) as pool:
+            # Start and warm the workers so only steady-state throughput is timed.
+            started = time.perf_counter()
+            for _ in pool.render(rows(processes * args.chunk_size)):
+                pass
+            warmup = time.perf_counter() - started
+
+            start = time.perf_counter()
+            rendered = sum(1 for _, output, error in pool.render(rows(args.rows)) if output and not error)
+            elapsed = time.perf_counter() - start
+        assert rendered == args.rows
+        rate = args.rows / elapsed
+        baseline = baseline or rate
+        print(f"processes={processes:>3}: {rate:>8.0f} rows/s ({rate / baseline:.1f}x), warm-up {warmup:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""Cost of retrying a bulk job that died part-way, restarting vs resuming.
+
+Rows go through the worker's generation loop (render, batched inserts and
+uploads to fake storage with a fixed latency) against a throwaway SQLite
+database. A first attempt is killed after a fraction of the rows; the retry
+then either starts over from row 0 (the old behaviour) or resumes from the
+``bulk_job_results`` checkpoint, whose cost should track the unfinished rows.
+
+Usage (from backend/):
+    python benchmarks/bench_resume.py [--rows 1000] [--crash-at 0.25 0.5 0.75 0.9] [--latency 0.005]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+_db_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir.name}/bench.db"
+
+from app.dependencies import SessionLocal, init_db  # noqa: E402
+from app.models import BulkJob, Template  # noqa: E402
+from app.services.job_results import JobResultWriter, clear_results, load_checkpoint  # noqa: E402
+from app.services.storage_backends import MemoryStorageBackend  # noqa: E402
+from app.services.storage_service import StorageService  # noqa: E402
+from worker.jobs import _generate_rows  # noqa: E402
+
+
+TEMPLATE = (
+    "<!DOCTYPE html><html><head><title>{{ title }}</title></head><body><main>"
+    "{% for i in range(40) %}<p>{{ service }} in {{ city }}, part {{ i }}.</p>{% endfor %}"
+    "</main></body></html>"
+)
+
+
+class Crash(Exception):
+    pass
+
+
+def rows(count: int, crash_after: int | None = None):
+    for i in range(count):
+        if crash_after is not None and i >= crash_after:
+            raise Crash()
+        yield i, {"title": f"Plumbers in City {i}", "city": f"City {i}", "service": "plumbing"}
+
+
+def new_job(db):
+    user_id = str(uuid.uuid4())
+    template = Template(user_id=user_id, name="bench", html_content=TEMPLATE, variables=["title"])
+    job = BulkJob(user_id=user_id)
+    db.add_all([template, job])
+    db.commit()
+    return user_id, template, job.id
+
+
+def generate(db, storage, template, user_id, job_id, items) -> None:
+    _generate_rows(db, storage, template, user_id, items, JobResultWriter(db, job_id))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--crash-at", type=float, nargs="+", default=[0.25, 0.5, 0.75, 0.9])
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    storage = StorageService(None, backend=MemoryStorageBackend(args.latency))
+
+    user_id, template, job_id = new_job(db)
+    start = time.perf_counter()
+    generate(db, storage, template, user_id, job_id, rows(args.rows))
+    full = time.perf_counter() - start
+    print(f"full run:  {full:6.2f}s for {args.rows} rows")
+
+    for fraction in args.crash_at:
+        crash_after = int(args.rows * fraction)
+        timings = {}
+        for mode in ("restart", "resume"):
+            user_id, template, job_id = new_job(db)
+            try:
+                generate(db, storage, template, user_id, job_id, rows(args.rows, crash_after))
+            except Crash:
+                db.rollback()
+
+            start = time.perf_counter()
+            if mode == "restart":
+                clear_results(db, job_id)
+                generate(db, storage, template, user_id, job_id, rows(args.rows))
+            else:
+                checkpoint = load_checkpoint(db, job_id, 0, args.rows)
+                remaining = ((i, row) for i, row in rows(args.rows) if i not in checkpoint)
+                generate(db, storage, template, user_id, job_id, remaining)
+            timings[mode] = time.perf_counter() - start
+
+        unfinished = 1 - fraction
+        print(
+            f"crash at {fraction:>4.0%}: restart {timings['restart']:6.2f}s, "
+            f"resume {timings['resume']:6.2f}s ({timings['resume'] / full:.0%} of a full run, "
+            f"{unfinished:.0%} of rows unfinished)"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Wall-clock time of uploading N pages sequentially vs through UploadPipeline.
+
+Storage is faked with a fixed per-request latency and an optional failure rate,
+so this runs offline.
+
+Usage (from backend/):
+    python benchmarks/bench_uploads.py [--pages 200] [--latency 0.05] [--in-flight 1 4 8 16]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.storage_backends import MemoryStorageBackend  # noqa: E402
+from app.services.storage_service import StorageService  # noqa: E402
+from app.services.upload_pipeline import UploadPipeline  # noqa: E402
+
+
+def slow_storage(latency: float, failure_rate: float) -> StorageService:
+    return StorageService(None, backend=MemoryStorageBackend(latency, failure_rate))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    pages = [(f"bench/page-{i}.html", f"<p>page {i}</p>" * 200) for i in range(args.pages)]
+
+    storage = slow_storage(args.latency, 0.0)
+    start = time.perf_counter()
+    for key, html in pages:
+        storage.upload_html_with_key(key, html)
+    sequential = time.perf_counter() - start
+    print(f"sequential: {sequential:.2f}s")
+
+    for in_flight in args.in_flight:
+        storage = slow_storage(args.latency, args.failure_rate)
+        pipeline = UploadPipeline(storage, max_in_flight=in_flight, backoff=args.latency)
+        start = time.perf_counter()
+        for key, html in pages:
+            pipeline.submit(key, html)
+        outcomes = pipeline.drain()
+        elapsed = time.perf_counter() - start
+        assert [o["key"] for o in outcomes] == [key for key, _ in pages]
+        failed = sum(1 for o in outcomes if o["error"])
+        retried = sum(1 for o in outcomes if o["attempts"] > 1)
+        print(
+            f"in_flight={in_flight:>3}: {elapsed:.2f}s ({sequential / elapsed:.1f}x) "
+            f"retried={retried} failed={failed}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Per-job overhead of small jobs, forking RQ worker vs warm worker.
+
+Each job is what a single-page request costs a worker: one template render
+and a query against a throwaway SQLite database. The forking worker runs
+every job in a fresh child, so it re-opens the connection and recompiles
+the template each time; the warm worker keeps both across jobs. Both drain
+the same number of jobs from a scratch queue in burst mode.
+
+Needs a running Redis (the fork mode can't share an in-process fake).
+
+Usage (from backend/):
+    python benchmarks/bench_worker.py [--jobs 200] [--redis-url redis://localhost:6379/15]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+_db_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir.name}/bench.db"
+
+from redis import Redis  # noqa: E402
+from rq import Queue, Worker  # noqa: E402
+from sqlalchemy import func  # noqa: E402
+
+from app.dependencies import SessionLocal, init_db  # noqa: E402
+from app.models import Page  # noqa: E402
+from app.services.template_service import render_template  # noqa: E402
+from app.services.worker_pool import WarmWorker, current_rss  # noqa: E402
+
+
+TEMPLATE = (
+    "<!DOCTYPE html><html><head><title>{{ title }}</title></head><body><main>"
+    "{% for i in range(40) %}<p>{{ service }} in {{ city }}, part {{ i }}.</p>{% endfor %}"
+    "</main></body></html>"
+)
+QUEUE = "bench-worker"
+
+
+def small_job(i: int) -> int:
+    db = SessionLocal()
+    try:
+        db.query(func.count(Page.id)).scalar()
+    finally:
+        db.close()
+    return len(render_template(TEMPLATE, {"title": f"Page {i}", "city": f"City {i}", "service": "plumbing"}))
+
+
+def drain(connection: Redis, mode: str, jobs: int) -> float:
+    queue = Queue(QUEUE, connection=connection)
+    queue.empty()
+    for i in range(jobs):
+        queue.enqueue(small_job, i, result_ttl=0)
+    worker_class = WarmWorker if mode == "warm" else Worker
+    worker = worker_class([queue], connection=connection)
+    start = time.perf_counter()
+    worker.work(burst=True, logging_level="WARNING")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    args = parser.parse_args()
+
+    init_db()
+    connection = Redis.from_url(args.redis_url)
+    timings = {mode: drain(connection, mode, args.jobs) for mode in ("fork", "warm")}
+    for mode, elapsed in timings.items():
+        print(f"{mode:>5}: {elapsed:6.2f}s for {args.jobs} jobs, {elapsed / args.jobs * 1000:6.2f}ms per job")
+    print(f"warm worker is {timings['fork'] / timings['warm']:.1f}x faster per job (RSS {current_rss() // (1024 * 1024)} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,150 +1,746 @@
+import logging
 import os
-import io
+import time
 import uuid
-import zipfile
-from typing import Dict, List, Optional
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
 from datetime import datetime
-from rq import Queue
+from rq import Retry, get_current_job
+from rq.job import Dependency, Job
 
+from app.config import settings
 from app.dependencies import SessionLocal, supabase
-from app.models import BulkJob, Template
-from app.services.page_service import generate_page
-from app.services.storage_service import StorageService
+from app.models import BulkJob, Page, Template
+from app.services.csv_service import delete_csv, iter_job_rows, split_csv
+from app.services.job_progress import JobProgress
+from app.services.job_queue import bulk_job_timeout, enqueue_meta, get_lane_queue, lane_for
+from app.services.job_results import JobResultWriter, clear_results, iter_page_results, load_checkpoint
+from app.services.page_search import search_text
+from app.services.page_service import PageBatchWriter, bulk_row_fields, robots_for, storage_key_for
+from app.services.render_pool import RenderPool
+from app.services.storage_service import StorageService, upload_storage
+from app.services.uniqueness import Reservations, UniquenessIndex
+from app.services.upload_pipeline import UploadPipeline
+from app.services.zip_service import BulkZipWriter
+from app.utils.seo import content_hash
 from worker.redis_conn import get_redis_connection
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import PendingRollbackError
 
 redis_conn = get_redis_connection()
+logger = logging.getLogger("worker.bulk")
 
+ZIP_PAGE_BATCH = 500
+REGENERATE_BATCH = 500
 
-def _pick_value(variables: Dict[str, str], keys: List[str]) -> Optional[str]:
-    for key in keys:
-        value = variables.get(key)
-        if value:
-            return str(value)
-    for k, v in variables.items():
-        if any(token in k.lower() for token in keys):
-            if v:
-                return str(v)
-    return None
 
+def _enqueue_kwargs(timeout: int) -> Dict:
+    kwargs = {"job_timeout": timeout}
+    # Windows doesn't support SIGALRM (used by RQ timeouts)
+    if os.name == "nt":
+        kwargs.pop("job_timeout", None)
+    return kwargs
+
+
+def _update_job(db: Session, job_id: str, **fields) -> None:
+    try:
+        db.rollback()
+    except PendingRollbackError:
+        db.rollback()
+    job = db.query(BulkJob).filter(BulkJob.id == job_id).first()
+    if not job:
+        return
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.updated_at = datetime.utcnow()
+    db.commit()
+
+
+def _generate_rows(
+    db: Session,
+    storage: StorageService,
+    template: Template,
+    user_id: str,
+    rows: Iterable[Tuple[int, Dict[str, str]]],
+    results: JobResultWriter,
+    zip_writer: Optional[BulkZipWriter] = None,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+    progress: Optional[JobProgress] = None,
+    claim_owner: Optional[str] = None,
+) -> Dict:
+    """Generate a page per ``(row index, row)`` pair.
+
+    Every row's outcome is written to ``results``, and each page is added to
+    ``zip_writer`` once its upload has succeeded, so only pages with uploads
+    in flight are held in memory. Returns ``processed``/``failed`` counts.
+    Row counts go to ``progress`` as rows complete, while ``on_progress``
+    receives the counts at most every ``settings.progress_flush_interval``
+    seconds.
+
+    Titles and slugs are claimed under ``claim_owner`` in Redis as well (see
+    ``Reservations``), so concurrent shards of the user never share one; it
+    must be the same for every attempt of the same rows.
+    """
+    result = {"processed": 0, "failed": 0}
+    # (row index, row, page id, url, ZIP filename, html) per upload not
+    # settled yet, aligned with the pipeline.
+    in_flight: Deque[tuple] = deque()
+    failed_uploads: List[tuple] = []
+    uploads = UploadPipeline(storage)
+
+    def render_items():
+        for i, row in rows:
+            variables, *fields = bulk_row_fields(i, row)
+            # The same dict travels with the key, so pickling it once covers both.
+            yield (i, row, variables, tuple(fields)), variables, fields[0], fields[1]
+
+    def settle(outcomes) -> None:
+        for outcome in outcomes:
+            i, row, page_id, url, filename, html = in_flight.popleft()
+            if outcome["error"]:
+                failed_uploads.append((i, row, page_id, outcome["error"]))
+                continue
+            results.page_uploaded(i)
+            if zip_writer is not None:
+                zip_writer.add(filename, html, url)
+
+    def record(outcomes) -> None:
+        processed, failed = result["processed"], result["failed"]
+        errors = []
+        for (i, row), page, url, error in outcomes:
+            if error is not None:
+                result["failed"] += 1
+                results.add_error(i, error, row)
+                errors.append({"row_number": i + 1, "error": error})
+                continue
+            # The row's result was inserted with the page (see ``on_insert`` below).
+            html = (page["html_content"] or "") if zip_writer is not None else None
+            in_flight.append((i, row, page["id"], url, f"{page['slug']}.html", html))
+            result["processed"] += 1
+        if progress is not None:
+            progress.add(result["processed"] - processed, result["failed"] - failed, errors)
+        settle(uploads.ready())
+
+    def reservations(column: str) -> Optional[Reservations]:
+        if claim_owner is None:
+            return None
+        return Reservations(redis_conn, user_id, column, claim_owner, settings.bulk_claim_ttl)
+
+    # Rendering and SEO post-processing may run ahead in worker processes;
+    # persistence (in multi-row batches) and uploads stay in this process.
+    # Slugs and titles for every row are allocated against one snapshot of the
+    # user's pages; the database is only touched again for the inserts.
+    writer = PageBatchWriter(
+        db,
+        storage,
+        template,
+        user_id,
+        is_bulk=True,
+        uploads=uploads,
+        slugs=UniquenessIndex.load(db, Page.slug, user_id, reservations=reservations("slug")),
+        titles=UniquenessIndex.load(db, Page.title, user_id, reservations=reservations("title")),
+        on_insert=lambda inserted: results.insert_pages([(i, page) for (i, _), page in inserted]),
+    )
+    flushed_at = time.monotonic()
+    with RenderPool(template.html_content, robots_for(True)) as pool:
+        for (i, row, variables, fields), output, error in pool.render(render_items()):
+            if error is not None:
+                record([((i, row), None, None, error)])
+            else:
+                title, meta_description, slug = fields
+                record(writer.add((i, row), title, meta_description, slug, output[1], variables))
 
-def process_bulk_job(job_id: str, user_id: str, template_id: str, rows: List[Dict[str, str]]):
-    """Process bulk page generation job from parsed CSV rows."""
+            if on_progress and time.monotonic() - flushed_at >= settings.progress_flush_interval:
+                on_progress(result)
+                flushed_at = time.monotonic()
+        record(writer.flush())
+    settle(uploads.drain())
+
+    # Pages are committed before their upload finishes; drop the ones whose
+    # upload ultimately failed so they are reported like any other failed row.
+    if failed_uploads:
+        page_ids = [page_id for _, _, page_id, _ in failed_uploads]
+        results.drop_pages(page_ids)
+        db.query(Page).filter(Page.id.in_(page_ids)).delete(synchronize_session=False)
+        for i, row, _, error in failed_uploads:
+            results.add_error(i, error, row)
+        result["processed"] -= len(failed_uploads)
+        result["failed"] += len(failed_uploads)
+        if progress is not None:
+            progress.add(
+                processed=-len(failed_uploads),
+                failed=len(failed_uploads),
+                errors=[{"row_number": i + 1, "error": error} for i, _, _, error in failed_uploads],
+            )
+    results.flush()
+
+    return result
+
+
+def _upload_zip(
+    storage: StorageService,
+    user_id: str,
+    job_id: str,
+    entries: Iterable[Tuple[str, str, Optional[str]]],
+) -> List[str]:
+    """Build the bulk download from ``(filename, html, url)`` entries; returns its part URLs."""
+    with BulkZipWriter() as zip_writer:
+        for filename, html, url in entries:
+            zip_writer.add(filename, html, url)
+        return zip_writer.upload(storage, f"{user_id}/bulk-{job_id}")
+
+
+def _last_attempt() -> bool:
+    """Whether the running RQ job will not be retried if it fails."""
+    job = get_current_job()
+    return job is None or not job.retries_left
+
+
+def _cleanup_csv(storage: StorageService, job_id: str, source: Union[str, List[Dict[str, str]]]) -> None:
+    # Only called once the job is done, successfully or on its last attempt;
+    # the CSV must survive RQ retries.
+    if isinstance(source, str):
+        try:
+            delete_csv(storage, source)
+        except Exception:
+            logger.warning("bulk_job_csv_cleanup_failed job_id=%s key=%s", job_id, source, exc_info=True)
+
+
+def _discard_objects(storage: StorageService, job_id: str, urls: List[str]) -> None:
+    """Delete the uploads of pages a checkpoint discarded; a leftover object is only logged."""
+    if not urls:
+        return
+    try:
+        storage.delete([storage_key_for(url) for url in urls])
+    except Exception:
+        logger.warning("bulk_job_discard_failed job_id=%s objects=%s", job_id, len(urls), exc_info=True)
+
+
+def _load_template(db: Session, template_id: str, user_id: str) -> Template:
+    template = (
+        db.query(Template)
+        .filter(Template.id == template_id, Template.user_id == user_id)
+        .first()
+    )
+    if not template:
+        raise ValueError("Template not found")
+    return template
+
+
+def process_bulk_job(
+    job_id: str,
+    user_id: str,
+    template_id: str,
+    source: Union[str, List[Dict[str, str]]],
+):
+    """Process bulk page generation job, streaming rows from the stored CSV.
+
+    Jobs larger than ``settings.bulk_shard_size`` rows are split into shards
+    that run as separate RQ jobs; see ``fan_out_bulk_job``. A retried job
+    resumes from its checkpoint: rows that already have a result are skipped.
+    """
     db = SessionLocal()
     storage = StorageService(supabase)
+    csv_storage = upload_storage(supabase)
+    if isinstance(source, str):
+        total_rows = db.query(BulkJob.total_rows).filter(BulkJob.id == job_id).scalar() or 0
+    else:
+        total_rows = len(source)
 
-    def update_job(
-        status: str,
-        processed: int,
-        failed: int,
-        total: int,
-        urls: List[Dict],
-        errors: List[Dict],
-    ) -> None:
-        try:
-            db.rollback()
-        except PendingRollbackError:
-            db.rollback()
-        job = db.query(BulkJob).filter(BulkJob.id == job_id).first()
-        if not job:
+    progress = JobProgress(redis_conn, job_id)
+
+    checkpoint = None
+
+    def flush_counts(result: Dict) -> None:
+        # Periodic snapshot of the counters only; row results have their own table.
+        _update_job(
+            db,
+            job_id,
+            processed_rows=checkpoint.processed + result["processed"],
+            failed_rows=checkpoint.failed + result["failed"],
+        )
+
+    try:
+        if isinstance(source, str) and total_rows > settings.bulk_shard_size:
+            _load_template(db, template_id, user_id)
+            if Job.exists(_finalize_job_id(job_id), connection=redis_conn):
+                # An earlier attempt already fanned out; its shards own the counters.
+                logger.info("bulk_job_already_fanned_out job_id=%s", job_id)
+                return
+            _update_job(
+                db,
+                job_id,
+                status="processing",
+                processed_rows=0,
+                failed_rows=0,
+                zip_url=None,
+                zip_parts=None,
+                error=None,
+            )
+            progress.start(total_rows)
+            fan_out_bulk_job(job_id, user_id, template_id, source, total_rows)
+            return
+
+        template = _load_template(db, template_id, user_id)
+        # Rows an earlier attempt (RQ retry or crashed worker) finished are skipped.
+        checkpoint = load_checkpoint(db, job_id, 0, total_rows)
+        _discard_objects(storage, job_id, checkpoint.discarded)
+        progress.start(total_rows, checkpoint.processed, checkpoint.failed)
+        _update_job(
+            db,
+            job_id,
+            status="processing",
+            processed_rows=checkpoint.processed,
+            failed_rows=checkpoint.failed,
+            total_rows=total_rows,
+            zip_url=None,
+            zip_parts=None,
+            error=None,
+        )
+
+        with BulkZipWriter() as zip_writer:
+            for filename, html, url in _zip_entries_from_db(db, checkpoint.pages):
+                zip_writer.add(filename, html, url)
+            result = _generate_rows(
+                db,
+                storage,
+                template,
+                user_id,
+                ((i, row) for i, row in enumerate(iter_job_rows(csv_storage, source)) if i not in checkpoint),
+                JobResultWriter(db, job_id),
+                zip_writer=zip_writer,
+                on_progress=flush_counts,
+                progress=progress,
+                claim_owner=job_id,
+            )
+            zip_urls = zip_writer.upload(storage, f"{user_id}/bulk-{job_id}")
+        zip_url = zip_urls[0] if zip_urls else None
+
+        processed = checkpoint.processed + result["processed"]
+        failed = checkpoint.failed + result["failed"]
+        status = "completed" if failed == 0 else "completed_with_errors"
+        _update_job(
+            db,
+            job_id,
+            status=status,
+            processed_rows=processed,
+            failed_rows=failed,
+            total_rows=total_rows,
+            zip_url=zip_url,
+            zip_parts=zip_urls if len(zip_urls) > 1 else None,
+        )
+        progress.finish(status, processed, failed, zip_url=zip_url)
+        _cleanup_csv(csv_storage, job_id, source)
+    except Exception as exc:
+        # Counters are left as last flushed; a retry resumes from the checkpoint.
+        if not _last_attempt():
+            _update_job(db, job_id, status="queued", total_rows=total_rows, error=str(exc))
+            progress.retrying(str(exc))
+            raise
+        _update_job(db, job_id, status="failed", total_rows=total_rows, error=str(exc))
+        job = db.query(BulkJob.processed_rows, BulkJob.failed_rows).filter(BulkJob.id == job_id).first()
+        progress.finish("failed", job[0] if job else 0, job[1] if job else 0, error=str(exc))
+        _cleanup_csv(csv_storage, job_id, source)
+        raise
+    finally:
+        db.close()
+
+
+def _shard_job_id(job_id: str, start: int) -> str:
+    return f"{job_id}-shard-{start}"
+
+
+def _finalize_job_id(job_id: str) -> str:
+    return f"{job_id}-finalize"
+
+
+def fan_out_bulk_job(job_id: str, user_id: str, template_id: str, csv_key: str, total_rows: int) -> List[Job]:
+    """Enqueue one shard job per row range plus a coordinator that waits for all of them.
+
+    The CSV is split first so that each shard downloads and parses only its
+    own rows. Shards go to the large lane, where the tenant fair share limits
+    how many of them run at once.
+
+    Shard and coordinator job IDs derive from ``job_id``, so a parent retried
+    after a partial fan-out reuses the shards already enqueued instead of
+    running their rows twice.
+    """
+    queue = get_lane_queue("large", redis_conn)
+    meta = enqueue_meta("large", user_id)
+    csv_storage = upload_storage(supabase)
+
+    shard_jobs = []
+    shards = []
+    shard_keys = []
+    start = 0
+    for key, rows in split_csv(csv_storage, csv_key, settings.bulk_shard_size):
+        end = start + rows
+        shard_id = _shard_job_id(job_id, start)
+        if Job.exists(shard_id, connection=redis_conn):
+            shard = Job.fetch(shard_id, connection=redis_conn)
+        else:
+            shard = queue.enqueue(
+                "worker.jobs.process_bulk_shard",
+                job_id,
+                user_id,
+                template_id,
+                csv_key,
+                start,
+                end,
+                job_id=shard_id,
+                shard_key=key,
+                result_ttl=settings.bulk_shard_result_ttl,
+                meta=meta,
+                retry=Retry(max=settings.bulk_shard_retries) if settings.bulk_shard_retries else None,
+                **_enqueue_kwargs(settings.bulk_shard_timeout),
+            )
+        shard_jobs.append(shard)
+        shards.append((shard.id, start, end))
+        shard_keys.append(key)
+        start = end
+
+    queue.enqueue(
+        "worker.jobs.finalize_bulk_job",
+        job_id,
+        user_id,
+        csv_key,
+        shards,
+        shard_keys=shard_keys,
+        job_id=_finalize_job_id(job_id),
+        depends_on=Dependency(jobs=shard_jobs, allow_failure=True),
+        meta=meta,
+        **_enqueue_kwargs(settings.bulk_shard_timeout),
+    )
+    return shard_jobs
+
+
+def process_bulk_shard(
+    job_id: str,
+    user_id: str,
+    template_id: str,
+    csv_key: str,
+    start: int,
+    end: int,
+    shard_key: Optional[str] = None,
+) -> Dict:
+    """Generate pages for rows ``[start, end)`` of a sharded bulk job.
+
+    The rows are read from ``shard_key``, the shard's own part of the CSV
+    (see ``split_csv``); shards enqueued without one read ``csv_key`` up to
+    their range.
+
+    Row counts go to the parent job's live Redis counters as rows complete
+    and are added to the ``BulkJob`` row periodically. Row results go to
+    ``bulk_job_results``; the returned counts (kept as the RQ result) are
+    what ``finalize_bulk_job`` aggregates. Shards are retried by RQ and
+    resume from their checkpoint; live counters may overcount rows a failed
+    attempt had started until ``finalize_bulk_job`` sets the final numbers.
+    """
+    db = SessionLocal()
+    storage = StorageService(supabase)
+    csv_storage = upload_storage(supabase)
+    flushed = {"processed": 0, "failed": 0}
+
+    def add_progress(progress: Dict) -> None:
+        processed = progress["processed"] - flushed["processed"]
+        failed = progress["failed"] - flushed["failed"]
+        if not processed and not failed:
             return
-        job.status = status
-        job.processed_rows = processed
-        job.failed_rows = failed
-        job.total_rows = total
-        job.updated_at = datetime.utcnow()
-        job.result_urls = urls
-        job.errors = errors
+        db.query(BulkJob).filter(BulkJob.id == job_id).update(
+            {
+                BulkJob.processed_rows: BulkJob.processed_rows + processed,
+                BulkJob.failed_rows: BulkJob.failed_rows + failed,
+                BulkJob.updated_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
         db.commit()
+        flushed["processed"] = progress["processed"]
+        flushed["failed"] = progress["failed"]
 
     try:
-        update_job("processing", 0, 0, len(rows), [], [])
-
-        template = (
-            db.query(Template)
-            .filter(Template.id == template_id, Template.user_id == user_id)
-            .first()
+        template = _load_template(db, template_id, user_id)
+        checkpoint = load_checkpoint(db, job_id, start, end)
+        _discard_objects(storage, job_id, checkpoint.discarded)
+        if shard_key is not None:
+            numbered = enumerate(iter_job_rows(csv_storage, shard_key), start)
+        else:
+            numbered = islice(enumerate(iter_job_rows(csv_storage, csv_key)), start, end)
+        rows = ((i, row) for i, row in numbered if i not in checkpoint)
+        result = _generate_rows(
+            db,
+            storage,
+            template,
+            user_id,
+            rows,
+            JobResultWriter(db, job_id),
+            on_progress=add_progress,
+            progress=JobProgress(redis_conn, job_id),
+            claim_owner=f"{job_id}:{start}",
         )
-        if not template:
-            raise ValueError("Template not found")
+        add_progress(result)
+        return {
+            "processed": checkpoint.processed + result["processed"],
+            "failed": checkpoint.failed + result["failed"],
+        }
+    finally:
+        db.close()
+
+
+def _shard_failure(shard_id: str) -> str:
+    try:
+        shard = Job.fetch(shard_id, connection=redis_conn)
+    except Exception:
+        return "Shard result expired"
+    exc_info = (shard.exc_info or "").strip().splitlines()
+    return f"Shard failed: {exc_info[-1]}" if exc_info else f"Shard {shard.get_status()}"
 
-        total_rows = len(rows)
-        processed = 0
-        failed = 0
-        result_urls: List[Dict] = []
-        zip_entries: List[Dict[str, str]] = []
-        errors: List[Dict] = []
 
-        for i, row in enumerate(rows):
+def _zip_entries_from_db(
+    db: Session, pages: List[Tuple[str, Optional[str]]]
+) -> Iterable[Tuple[str, str, Optional[str]]]:
+    """Yield ``(filename, html, url)`` for ``(page_id, url)`` pairs, loading HTML in batches."""
+    for offset in range(0, len(pages), ZIP_PAGE_BATCH):
+        batch = pages[offset:offset + ZIP_PAGE_BATCH]
+        loaded = {
+            page_id: (slug, html)
+            for page_id, slug, html in db.query(Page.id, Page.slug, Page.html_content)
+            .filter(Page.id.in_([page_id for page_id, _ in batch]))
+        }
+        for page_id, url in batch:
+            if page_id in loaded:
+                slug, html = loaded[page_id]
+                yield f"{slug}.html", html or "", url
+
+
+def finalize_bulk_job(
+    job_id: str,
+    user_id: str,
+    csv_key: str,
+    shards: List[Tuple[str, int, int]],
+    shard_keys: Optional[List[str]] = None,
+):
+    """Aggregate shard results into the parent ``BulkJob`` and build the ZIP."""
+    db = SessionLocal()
+    storage = StorageService(supabase)
+    csv_storage = upload_storage(supabase)
+    progress = JobProgress(redis_conn, job_id)
+    processed = 0
+    failed = 0
+    try:
+        results = JobResultWriter(db, job_id)
+
+        for shard_id, start, end in shards:
+            result = None
             try:
-                variables = {str(k).strip(): v for k, v in (row or {}).items()}
+                shard = Job.fetch(shard_id, connection=redis_conn)
+                if shard.get_status() == "finished":
+                    result = shard.return_value()
+            except Exception:
+                result = None
 
-                title = _pick_value(variables, ["title", "name"]) or f"Page {i + 1}"
-                meta_description = (
-                    _pick_value(variables, ["meta_description", "description"]) or title
-                )
-                slug = _pick_value(variables, ["slug"])
-
-                page, url = generate_page(
-                    db=db,
-                    template=template,
-                    user_id=user_id,
-                    variables=variables,
-                    title=title[:255],
-                    meta_description=meta_description[:255],
-                    slug=slug,
-                    storage=storage,
-                    is_bulk=True,
-                )
+            if result is None:
+                # Keep the pages the shard finished; its unconfirmed pages are
+                # dropped and every row without a result fails with the shard.
+                checkpoint = load_checkpoint(db, job_id, start, end)
+                _discard_objects(storage, job_id, checkpoint.discarded)
+                error = _shard_failure(shard_id)
+                for i in range(start, end):
+                    if i not in checkpoint:
+                        results.add_error(i, error)
+                processed += checkpoint.processed
+                failed += end - start - checkpoint.processed
+                continue
+            processed += result["processed"]
+            failed += result["failed"]
+        results.flush()
 
-                result_urls.append(
-                    {
-                        "url": url,
-                        "title": page.title,
-                        "slug": page.slug,
-                        "seo_score": page.seo_score,
-                    }
-                )
-                zip_entries.append(
+        pages = list(iter_page_results(db, job_id))
+        zip_urls = _upload_zip(storage, user_id, job_id, _zip_entries_from_db(db, pages))
+        zip_url = zip_urls[0] if zip_urls else None
+
+        status = "completed" if failed == 0 else "completed_with_errors"
+        _update_job(
+            db,
+            job_id,
+            status=status,
+            processed_rows=processed,
+            failed_rows=failed,
+            zip_url=zip_url,
+            zip_parts=zip_urls if len(zip_urls) > 1 else None,
+        )
+        progress.finish(status, processed, failed, zip_url=zip_url)
+    except Exception as exc:
+        _update_job(db, job_id, status="failed", error=str(exc))
+        progress.finish("failed", processed, failed, error=str(exc))
+        raise
+    finally:
+        # The coordinator is not retried, so the CSVs go either way.
+        for key in [csv_key, *(shard_keys or [])]:
+            _cleanup_csv(csv_storage, job_id, key)
+        db.close()
+
+
+def _template_page_batches(db: Session, template_id: str, user_id: str, is_bulk: bool) -> Iterable[List]:
+    """Pages of a template in id order, ``REGENERATE_BATCH`` at a time, without their HTML."""
+    last_id = ""
+    while True:
+        batch = (
+            db.query(
+                Page.id,
+                Page.title,
+                Page.meta_description,
+                Page.slug,
+                Page.storage_url,
+                Page.variables,
+                Page.render_hash,
+            )
+            .filter(
+                Page.template_id == template_id,
+                Page.user_id == user_id,
+                Page.is_bulk == is_bulk,
+                Page.id > last_id,
+            )
+            .order_by(Page.id)
+            .limit(REGENERATE_BATCH)
+            .all()
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+
+def regenerate_template_pages(job_id: str, user_id: str, template_id: str):
+    """Re-render every page of a template from its stored variables after the template changed.
+
+    Pages are processed in batches of ``REGENERATE_BATCH``. Only pages whose
+    output hash differs from their ``render_hash`` are re-uploaded, under
+    their existing key so URLs stay the same, and then updated; those are
+    the job's results. Unchanged pages are counted as processed without any
+    write, so a retried job only redoes what is still stale. Pages created
+    before variables were stored can't be re-rendered and count as failed.
+    """
+    db = SessionLocal()
+    storage = StorageService(supabase)
+    progress = JobProgress(redis_conn, job_id)
+    counts = {"processed": 0, "failed": 0, "updated": 0}
+    try:
+        template = _load_template(db, template_id, user_id)
+        total = (
+            db.query(func.count(Page.id))
+            .filter(Page.template_id == template_id, Page.user_id == user_id)
+            .scalar()
+            or 0
+        )
+        clear_results(db, job_id)
+        progress.start(total)
+        _update_job(db, job_id, status="processing", total_rows=total, processed_rows=0, failed_rows=0, error=None)
+        results = JobResultWriter(db, job_id)
+        # (result index, page, html, hash, seo score, seo data) per pending upload.
+        in_flight: Deque[tuple] = deque()
+        updates: List[Dict] = []
+        index = 0
+        flushed_at = time.monotonic()
+
+        def fail(i: int, page, error: str) -> None:
+            counts["failed"] += 1
+            results.add_error(i, error, {"page_id": page.id, "slug": page.slug})
+
+        def settle(outcomes) -> None:
+            for outcome in outcomes:
+                i, page, html, render_hash, score, seo_data = in_flight.popleft()
+                if outcome["error"]:
+                    counts["processed"] -= 1
+                    fail(i, page, outcome["error"])
+                    continue
+                updates.append(
                     {
-                        "filename": f"{page.slug}.html",
-                        "content": page.html_content or "",
+                        "id": page.id,
+                        "html_content": html,
+                        "search_text": search_text(html),
+                        "render_hash": render_hash,
+                        "seo_score": score,
+                        "seo_data": seo_data,
+                        "word_count": seo_data["word_count"],
+                        "updated_at": datetime.utcnow(),
                     }
                 )
-                processed += 1
-
-                if (i + 1) % 10 == 0 or i == total_rows - 1:
-                    update_job("processing", processed, failed, total_rows, result_urls, errors)
-            except Exception as exc:
-                db.rollback()
-                failed += 1
-                errors.append(
-                    {
-                        "row": i + 1,
-                        "error": str(exc),
-                        "data": {k: str(v)[:100] for k, v in (row or {}).items()},
-                    }
+                results.add_page(
+                    i,
+                    {"id": page.id, "title": page.title, "slug": page.slug, "seo_score": score},
+                    page.storage_url,
                 )
+                results.page_uploaded(i)
+                counts["updated"] += 1
 
-        # Build zip for bulk downloads (URLs + HTML files)
-        if zip_entries:
-            buffer = io.BytesIO()
-            with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-                urls_text = "\n".join([item["url"] for item in result_urls if item.get("url")])
-                zf.writestr("urls.txt", urls_text)
-                for entry in zip_entries:
-                    zf.writestr(entry["filename"], entry["content"])
-            buffer.seek(0)
-
-            zip_key = f"{user_id}/bulk-{job_id}.zip"
-            storage.upload_bytes_with_key(zip_key, buffer.read(), "application/zip")
-            zip_url = storage.get_public_url(zip_key)
-            result_urls.append({"type": "zip", "url": zip_url})
+        def flush_updates() -> None:
+            if updates:
+                db.execute(update(Page), updates)
+                db.commit()
+                updates.clear()
+            results.flush()
 
-        status = "completed" if failed == 0 else "completed_with_errors"
-        update_job(status, processed, failed, total_rows, result_urls, errors)
+        with UploadPipeline(storage) as uploads:
+            for is_bulk in (True, False):
+                with RenderPool(template.html_content, robots_for(is_bulk)) as pool:
+                    for batch in _template_page_batches(db, template_id, user_id, is_bulk):
+                        done = (counts["processed"], counts["failed"])
+                        items = []
+                        pages = {}
+                        for page in batch:
+                            if page.variables is None:
+                                fail(index, page, "Page has no stored variables; it predates regeneration")
+                            else:
+                                pages[index] = page
+                                items.append((index, page.variables, page.title, page.meta_description))
+                            index += 1
+
+                        for i, output, error in pool.render(items):
+                            page = pages[i]
+                            if error is not None:
+                                fail(i, page, error)
+                                continue
+                            counts["processed"] += 1
+                            score, seo_data, html = output[1]
+                            render_hash = content_hash(html)
+                            if render_hash == page.render_hash:
+                                continue
+                            uploads.submit(storage_key_for(page.storage_url), html)
+                            in_flight.append((i, page, html, render_hash, score, seo_data))
+                            settle(uploads.ready())
+                        settle(uploads.ready())
+                        flush_updates()
+
+                        progress.add(counts["processed"] - done[0], counts["failed"] - done[1])
+                        if time.monotonic() - flushed_at >= settings.progress_flush_interval:
+                            _update_job(db, job_id, processed_rows=counts["processed"], failed_rows=counts["failed"])
+                            flushed_at = time.monotonic()
+            done = (counts["processed"], counts["failed"])
+            settle(uploads.drain())
+            flush_updates()
+            progress.add(counts["processed"] - done[0], counts["failed"] - done[1])
+
+        status = "completed" if counts["failed"] == 0 else "completed_with_errors"
+        _update_job(db, job_id, status=status, processed_rows=counts["processed"], failed_rows=counts["failed"])
+        progress.finish(status, counts["processed"], counts["failed"])
+        return counts
     except Exception as exc:
-        update_job("failed", 0, 0, len(rows), [], [{"error": str(exc)}])
+        if not _last_attempt():
+            _update_job(db, job_id, status="queued", error=str(exc))
+            progress.retrying(str(exc))
+            raise
+        _update_job(
+            db,
+            job_id,
+            status="failed",
+            processed_rows=counts["processed"],
+            failed_rows=counts["failed"],
+            error=str(exc),
+        )
+        progress.finish("failed", counts["processed"], counts["failed"], error=str(exc))
         raise
     finally:
         db.close()
@@ -153,11 +749,8 @@ def process_bulk_job(job_id: str, user_id: str, template_id: str, rows: List[Dic
 def create_bulk_job(user_id: str, template_id: str, rows: List[Dict[str, str]]) -> str:
     """Create and enqueue a bulk job from parsed rows."""
     job_id = str(uuid.uuid4())
-    queue = Queue("bulk", connection=redis_conn)
-
-    enqueue_kwargs = {"job_timeout": 3600}
-    if os.name == "nt":
-        enqueue_kwargs.pop("job_timeout", None)
+    lane = lane_for(len(rows))
+    queue = get_lane_queue(lane, redis_conn)
 
     queue.enqueue(
         "worker.jobs.process_bulk_job",
@@ -165,7 +758,8 @@ def create_bulk_job(user_id: str, template_id: str, rows: List[Dict[str, str]])
         user_id,
         template_id,
         rows,
-        **enqueue_kwargs,
+        meta=enqueue_meta(lane, user_id),
+        **_enqueue_kwargs(bulk_job_timeout(len(rows), sharded=False)),
     )
 
     return job_id
@@ -1,8 +1,10 @@
 import os
 import redis
-from rq import Worker, Queue
+from rq import Queue
 from dotenv import load_dotenv
 
+from app.services.job_queue import FairShareWorker, get_lane_queue, lane_queues
+
 load_dotenv()
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
@@ -12,12 +14,17 @@ def get_redis_connection():
     # RQ stores binary payloads; disable response decoding to avoid UnicodeDecodeError.
     return redis.from_url(REDIS_URL, decode_responses=False)
 
-def get_queue():
-    """Get RQ Queue"""
+def get_queue(lane: str = "small") -> Queue:
+    """Get the RQ Queue of a lane"""
+    redis_conn = get_redis_connection()
+    return get_lane_queue(lane, redis_conn)
+
+def get_queues():
+    """Get every lane's RQ Queue, highest priority first"""
     redis_conn = get_redis_connection()
-    return Queue("bulk", connection=redis_conn)
+    return lane_queues(redis_conn)
 
 def get_worker():
     """Get RQ Worker"""
     redis_conn = get_redis_connection()
-    return Worker([Queue("bulk", connection=redis_conn)], connection=redis_conn)
+    return FairShareWorker(lane_queues(redis_conn), connection=redis_conn)
@@ -1,9 +1,11 @@
 import os
 import sys
 from dotenv import load_dotenv
-from rq import Worker, SimpleWorker
 from rq.timeouts import TimerDeathPenalty
-from .redis_conn import get_redis_connection, get_queue
+from app.config import settings
+from app.services.job_queue import FairShareSimpleWorker, FairShareWorker
+from app.services.worker_pool import WorkerPool
+from .redis_conn import REDIS_URL, get_redis_connection, get_queues
 import logging
 
 # Add parent directory to path for imports
@@ -20,18 +22,25 @@ load_dotenv()
 
 def run_worker():
     """Start RQ worker"""
+    if settings.worker_mode == "warm":
+        logger.info(f"Starting {settings.worker_processes} warm RQ worker(s)...")
+        WorkerPool(settings.worker_processes, REDIS_URL, preload=("worker.jobs",)).run()
+        return
+
     redis_conn = get_redis_connection()
-    q = get_queue()
+    # Lanes are listed highest priority first; RQ always takes from the
+    # first non-empty queue.
+    queues = get_queues()
 
     if os.name == "nt":
         # Windows doesn't support SIGALRM; use TimerDeathPenalty instead.
-        worker = SimpleWorker([q], connection=redis_conn)
+        worker = FairShareSimpleWorker(queues, connection=redis_conn)
         worker.death_penalty_class = TimerDeathPenalty
     else:
-        worker = Worker([q], connection=redis_conn)
+        worker = FairShareWorker(queues, connection=redis_conn)
     
     logger.info("Starting RQ Worker...")
-    logger.info(f"Listening to queue: {q.name}")
+    logger.info(f"Listening to queues: {', '.join(q.name for q in queues)}")
     
     try:
         worker.work(with_scheduler=True)
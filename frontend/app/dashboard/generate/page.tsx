@@ -25,8 +25,7 @@ export default function GeneratePage() {
 
   const loadTemplates = async () => {
     try {
-      const res = await templatesApi.list();
-      setTemplates(res || []);
+      setTemplates(await templatesApi.listAll());
     } catch (error) {
       toast.error('Failed to load templates');
     }
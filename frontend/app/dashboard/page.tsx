@@ -26,21 +26,20 @@ export default function DashboardPage() {
     try {
       setLoading(true);
 
-      // Load templates
-      const templatesRes = await templatesApi.list();
-      const templates = Array.isArray(templatesRes) ? templatesRes : [];
+      // Only the newest few are shown; totals come from the stats endpoint.
+      const templatesRes = await templatesApi.list(undefined, 3);
+      const templates = Array.isArray(templatesRes?.items) ? templatesRes.items : [];
 
-      // Load pages
-      const pagesRes = await pagesApi.list();
-      const pages = Array.isArray(pagesRes) ? pagesRes : [];
+      const pagesRes = await pagesApi.list(undefined, 3);
+      const pages = Array.isArray(pagesRes?.items) ? pagesRes.items : [];
 
       // Load job stats
       const jobStats = await jobsApi.getStats();
       const recentJobs = await jobsApi.getRecent(5);
 
       setStats({
-        templates: templates.length,
-        pages: pages.length,
+        templates: jobStats.total_templates ?? templates.length,
+        pages: jobStats.total_pages ?? pages.length,
         jobs: jobStats.total_jobs,
       });
 
@@ -13,13 +13,17 @@ interface PageItem {
 
 export default function PagesPage() {
   const [pages, setPages] = useState<PageItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [jobStats, setJobStats] = useState({
     total_jobs: 0,
     queued: 0,
     processing: 0,
     completed: 0,
     failed: 0,
+    total_pages: 0,
+    page_statuses: {} as Record<string, number>,
   });
   const [recentJobs, setRecentJobs] = useState<any[]>([]);
 
@@ -36,7 +40,8 @@ export default function PagesPage() {
         jobsApi.getRecent(5),
       ]);
 
-      setPages(Array.isArray(pagesRes) ? pagesRes : []);
+      setPages(Array.isArray(pagesRes?.items) ? pagesRes.items : []);
+      setNextCursor(pagesRes?.next_cursor || null);
       setJobStats(statsRes || jobStats);
       setRecentJobs(Array.isArray(jobsRes) ? jobsRes : []);
     } catch (error) {
@@ -46,6 +51,25 @@ export default function PagesPage() {
     }
   };
 
+  const loadMorePages = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const res = await pagesApi.list(nextCursor);
+      setPages((prev) => [...prev, ...(Array.isArray(res?.items) ? res.items : [])]);
+      setNextCursor(res?.next_cursor || null);
+    } catch (error) {
+      toast.error('Failed to load more results');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Counts come from the server so they cover every page, not just the loaded ones.
+  const pageStatuses = jobStats.page_statuses || {};
+  const statusCount = (status: string) => pageStatuses[status] || 0;
+  const totalPages = jobStats.total_pages || 0;
+
   const deletePage = async (pageId: string) => {
     if (!confirm('Delete this page? This cannot be undone.')) {
       return;
@@ -53,6 +77,7 @@ export default function PagesPage() {
     try {
       await pagesApi.delete(pageId);
       setPages((prev) => prev.filter((page) => page.id !== pageId));
+      jobsApi.getStats().then((stats) => stats && setJobStats(stats)).catch(() => undefined);
       toast.success('Page deleted');
     } catch (error) {
       toast.error(error instanceof Error ? error.message : 'Failed to delete page');
@@ -110,30 +135,24 @@ export default function PagesPage() {
         <div className="grid grid-cols-2 md:grid-cols-5 gap-4">
           <div>
             <p className="text-sm text-gray-600">Total</p>
-            <p className="text-lg font-semibold text-gray-900">{pages.length}</p>
+            <p className="text-lg font-semibold text-gray-900">{totalPages}</p>
           </div>
           <div>
             <p className="text-sm text-gray-600">Active</p>
-            <p className="text-lg font-semibold text-gray-900">
-              {pages.filter((p: any) => p.status === 'active').length}
-            </p>
+            <p className="text-lg font-semibold text-gray-900">{statusCount('active')}</p>
           </div>
           <div>
             <p className="text-sm text-gray-600">Completed</p>
-            <p className="text-lg font-semibold text-gray-900">
-              {pages.filter((p: any) => p.status === 'completed').length}
-            </p>
+            <p className="text-lg font-semibold text-gray-900">{statusCount('completed')}</p>
           </div>
           <div>
             <p className="text-sm text-gray-600">Archived</p>
-            <p className="text-lg font-semibold text-gray-900">
-              {pages.filter((p: any) => p.status === 'archived').length}
-            </p>
+            <p className="text-lg font-semibold text-gray-900">{statusCount('archived')}</p>
           </div>
           <div>
             <p className="text-sm text-gray-600">Other</p>
             <p className="text-lg font-semibold text-gray-900">
-              {pages.filter((p: any) => !['active', 'completed', 'archived'].includes(p.status)).length}
+              {totalPages - statusCount('active') - statusCount('completed') - statusCount('archived')}
             </p>
           </div>
         </div>
@@ -233,6 +252,18 @@ export default function PagesPage() {
               </div>
             </div>
           ))}
+          {nextCursor && (
+            <div className="p-4 text-center">
+              <button
+                type="button"
+                onClick={loadMorePages}
+                disabled={loadingMore}
+                className="text-blue-600 hover:text-blue-800 text-sm disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
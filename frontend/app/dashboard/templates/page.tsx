@@ -14,7 +14,9 @@ interface TemplateItem {
 
 export default function TemplatesPage() {
   const [templates, setTemplates] = useState<TemplateItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadTemplates();
@@ -23,8 +25,9 @@ export default function TemplatesPage() {
   const loadTemplates = async () => {
     try {
       setLoading(true);
-      const res = await templatesApi.list(0, 50);
-      setTemplates(Array.isArray(res) ? res : []);
+      const res = await templatesApi.list(undefined, 50);
+      setTemplates(Array.isArray(res?.items) ? res.items : []);
+      setNextCursor(res?.next_cursor || null);
     } catch (error) {
       toast.error('Failed to load templates');
     } finally {
@@ -32,6 +35,20 @@ export default function TemplatesPage() {
     }
   };
 
+  const loadMoreTemplates = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const res = await templatesApi.list(nextCursor, 50);
+      setTemplates((prev) => [...prev, ...(Array.isArray(res?.items) ? res.items : [])]);
+      setNextCursor(res?.next_cursor || null);
+    } catch (error) {
+      toast.error('Failed to load more templates');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   return (
     <div className="space-y-6">
       <div className="flex items-center justify-between">
@@ -85,6 +102,18 @@ export default function TemplatesPage() {
               </div>
             </Link>
           ))}
+          {nextCursor && (
+            <div className="p-4 text-center">
+              <button
+                type="button"
+                onClick={loadMoreTemplates}
+                disabled={loadingMore}
+                className="text-blue-600 hover:text-blue-800 text-sm disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
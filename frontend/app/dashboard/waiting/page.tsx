@@ -43,43 +43,64 @@ export default function WaitingPage() {
     if (!jobId) return;
 
     let active = true;
+    let interval: ReturnType<typeof setInterval> | undefined;
+    const controller = new AbortController();
+
+    const handleStatus = async (status: any) => {
+      if (status.status === 'completed' || status.status === 'completed_with_errors') {
+        let downloadUrl = '';
+        if (mode === 'bulk') {
+          downloadUrl = status.zip_url || '';
+        } else {
+          const results = await bulkApi.getResults(jobId, 0, 1);
+          if (!active) return;
+          downloadUrl = results.items[0]?.url || '';
+        }
+
+        if (downloadUrl) {
+          const encoded = encodeURIComponent(downloadUrl);
+          router.replace(`/dashboard/download?jobId=${jobId}&mode=${mode}&url=${encoded}`);
+        } else {
+          router.replace(`/dashboard/result?jobId=${jobId}&mode=${mode}`);
+        }
+      } else if (status.status === 'failed') {
+        setError('Job failed. Please try again.');
+      }
+    };
+
     const poll = async () => {
       try {
         const status = await bulkApi.getStatus(jobId);
         if (!active) return;
         setJob(status);
-        if (status.status === 'completed' || status.status === 'completed_with_errors') {
-          let downloadUrl = '';
-          if (Array.isArray(status.result_urls) && status.result_urls.length > 0) {
-            if (mode === 'bulk') {
-              const zip = status.result_urls.find((r: any) => r.type === 'zip');
-              downloadUrl = zip?.url || '';
-            } else {
-              const first = status.result_urls.find((r: any) => r.url);
-              downloadUrl = first?.url || '';
-            }
-          }
-
-          if (downloadUrl) {
-            const encoded = encodeURIComponent(downloadUrl);
-            router.replace(`/dashboard/download?jobId=${jobId}&mode=${mode}&url=${encoded}`);
-          } else {
-            router.replace(`/dashboard/result?jobId=${jobId}&mode=${mode}`);
-          }
-        } else if (status.status === 'failed') {
-          setError('Job failed. Please try again.');
-        }
+        await handleStatus(status);
       } catch (err) {
         if (!active) return;
         setError('Unable to fetch job status.');
       }
     };
 
-    poll();
-    const interval = setInterval(poll, 2000);
+    // Progress is pushed over SSE; fall back to polling if the stream fails.
+    bulkApi
+      .streamEvents(
+        jobId,
+        (event) => {
+          if (!active) return;
+          setJob((prev: any) => ({ ...prev, ...event }));
+          handleStatus(event).catch(() => setError('Unable to fetch job status.'));
+        },
+        controller.signal,
+      )
+      .catch(() => {
+        if (!active) return;
+        poll();
+        interval = setInterval(poll, 2000);
+      });
+
     return () => {
       active = false;
-      clearInterval(interval);
+      controller.abort();
+      if (interval) clearInterval(interval);
     };
   }, [jobId, mode, router]);
 
@@ -11,17 +11,56 @@ interface BulkJobStatusProps {
 
 export function BulkJobStatus({ jobId, onComplete }: BulkJobStatusProps) {
   const [job, setJob] = useState<any>(null);
+  const [results, setResults] = useState<any[]>([]);
+  const [errors, setErrors] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
-  const [autoRefresh, setAutoRefresh] = useState(true);
+  const [polling, setPolling] = useState(false);
 
+  const isFinished = (status: string) =>
+    status === 'completed' || status === 'completed_with_errors' || status === 'failed';
+
+  // Progress is pushed over SSE; polling is only the fallback when the stream
+  // fails or ends without a final event.
   useEffect(() => {
-    loadJobStatus();
+    const controller = new AbortController();
+    let sawFinal = false;
+
+    loadJobStatus().then((finished) => {
+      if (finished || controller.signal.aborted) return;
+      bulkApi
+        .streamEvents(
+          jobId,
+          (event) => {
+            setJob((prev: any) => ({ ...prev, ...event }));
+            if (event.errors) {
+              setErrors((prev) => [...prev, ...event.errors].slice(-10));
+            }
+            if (isFinished(event.status)) {
+              sawFinal = true;
+              loadJobStatus();
+            }
+          },
+          controller.signal,
+        )
+        .then(async () => {
+          if (sawFinal || controller.signal.aborted) return;
+          // Closed early (restart, proxy timeout): re-check, then poll until done.
+          if (!(await loadJobStatus()) && !controller.signal.aborted) setPolling(true);
+        })
+        .catch(() => {
+          if (!controller.signal.aborted) setPolling(true);
+        });
+    });
+
+    return () => controller.abort();
+  }, [jobId]);
 
-    if (!autoRefresh) return;
+  useEffect(() => {
+    if (!polling) return;
 
     const interval = setInterval(loadJobStatus, 2000);
     return () => clearInterval(interval);
-  }, [jobId, autoRefresh]);
+  }, [jobId, polling]);
 
   const loadJobStatus = async () => {
     try {
@@ -29,14 +68,22 @@ export function BulkJobStatus({ jobId, onComplete }: BulkJobStatusProps) {
       setJob(status);
       setLoading(false);
 
-      // Stop auto-refresh when completed
-      if (status.status === 'completed' || status.status === 'completed_with_errors' || status.status === 'failed') {
-        setAutoRefresh(false);
+      if (isFinished(status.status)) {
+        setPolling(false);
+        // Row-level results are paginated separately; the first page is enough here.
+        const [firstResults, firstErrors] = await Promise.all([
+          bulkApi.getResults(jobId, 0, 10),
+          bulkApi.getErrors(jobId, 0, 10),
+        ]);
+        setResults(firstResults.items);
+        setErrors(firstErrors.items);
         onComplete?.();
+        return true;
       }
     } catch (error) {
       console.error(error);
     }
+    return false;
   };
 
   if (loading) {
@@ -81,7 +128,7 @@ export function BulkJobStatus({ jobId, onComplete }: BulkJobStatusProps) {
             <p className="text-sm text-gray-600">Processed</p>
           </div>
           <div className="text-center">
-            <p className="text-lg font-bold text-red-600">{job.error_count}</p>
+            <p className="text-lg font-bold text-red-600">{job.failed_rows}</p>
             <p className="text-sm text-gray-600">Errors</p>
           </div>
           <div className="text-center">
@@ -98,12 +145,12 @@ export function BulkJobStatus({ jobId, onComplete }: BulkJobStatusProps) {
       {/* Results */}
       {job.status === 'completed' || job.status === 'completed_with_errors' ? (
         <>
-          {job.result_urls.length > 0 && (
+          {job.processed_rows > 0 && (
             <div className="bg-white p-6 rounded-lg shadow">
-              <h3 className="text-xl font-bold mb-4">Generated Pages ({job.result_urls.length})</h3>
+              <h3 className="text-xl font-bold mb-4">Generated Pages ({job.processed_rows})</h3>
               <div className="space-y-2 max-h-64 overflow-y-auto">
-                {job.result_urls.slice(0, 10).map((result: any, idx: number) => (
-                  <div key={idx} className="p-3 bg-gray-50 rounded hover:bg-gray-100">
+                {results.map((result: any) => (
+                  <div key={result.row_number} className="p-3 bg-gray-50 rounded hover:bg-gray-100">
                     <div className="flex items-center justify-between">
                       <div className="flex-1">
                         <p className="font-medium text-gray-900 truncate">{result.title}</p>
@@ -117,13 +164,13 @@ export function BulkJobStatus({ jobId, onComplete }: BulkJobStatusProps) {
             </div>
           )}
 
-          {job.error_count > 0 && (
+          {job.failed_rows > 0 && (
             <div className="bg-white p-6 rounded-lg shadow">
-              <h3 className="text-xl font-bold mb-4 text-red-600">Errors ({job.error_count})</h3>
+              <h3 className="text-xl font-bold mb-4 text-red-600">Errors ({job.failed_rows})</h3>
               <div className="space-y-2 max-h-64 overflow-y-auto text-sm">
-                {job.errors?.slice(0, 10).map((error: any, idx: number) => (
-                  <div key={idx} className="p-3 bg-red-50 rounded border border-red-200">
-                    <p className="font-medium text-red-800">Row {error.row}</p>
+                {errors.map((error: any) => (
+                  <div key={error.row_number} className="p-3 bg-red-50 rounded border border-red-200">
+                    <p className="font-medium text-red-800">Row {error.data?.rows || error.row_number}</p>
                     <p className="text-red-700">{error.error}</p>
                   </div>
                 ))}
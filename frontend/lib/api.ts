@@ -88,6 +88,28 @@ export const authApi = {
   getCurrentUser: () => makeRequest('/api/auth/me'),
 };
 
+// List endpoints return { items, next_cursor }; pass next_cursor back for the next page.
+function listQuery(cursor?: string, limit = 50) {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) params.set('cursor', cursor);
+  return params.toString();
+}
+
+// Follows next_cursor to the end; for pickers that must offer every item.
+async function listAll(list: (cursor?: string, limit?: number) => Promise<any>, limit = 500) {
+  const items: any[] = [];
+  let cursor: string | undefined;
+  do {
+    const res = await list(cursor, limit);
+    items.push(...(Array.isArray(res?.items) ? res.items : []));
+    cursor = res?.next_cursor || undefined;
+  } while (cursor);
+  return items;
+}
+
+const listTemplates = (cursor?: string, limit?: number) =>
+  makeRequest(`/api/templates/?${listQuery(cursor, limit)}`, { method: 'GET' });
+
 // Templates API
 export const templatesApi = {
   create: (name: string, htmlContent: string, seoChecks?: any) =>
@@ -96,7 +118,9 @@ export const templatesApi = {
       body: { name, html_content: htmlContent, seo_checks: seoChecks },
     }),
 
-  list: () => makeRequest('/api/templates/', { method: 'GET' }),
+  list: listTemplates,
+
+  listAll: () => listAll(listTemplates),
 
   get: (templateId: string) =>
     makeRequest(`/api/templates/${templateId}`, { method: 'GET' }),
@@ -134,7 +158,8 @@ export const pagesApi = {
       body: { template_id: templateId, variables },
     }),
 
-  list: () => makeRequest('/api/pages/', { method: 'GET' }),
+  list: (cursor?: string, limit?: number) =>
+    makeRequest(`/api/pages/?${listQuery(cursor, limit)}`, { method: 'GET' }),
 
   get: (pageId: string) =>
     makeRequest(`/api/pages/${pageId}`),
@@ -153,7 +178,7 @@ export const pagesApi = {
 
   search: (query: string, skip?: number, limit?: number) =>
     makeRequest(
-      `/api/pages/search/${query}?skip=${skip || 0}&limit=${limit || 50}`
+      `/api/pages/search/${encodeURIComponent(query)}?skip=${skip || 0}&limit=${limit || 50}`
     ),
 
   getSeoReport: (pageId: string) =>
@@ -187,7 +212,34 @@ export const bulkApi = {
     return response.json();
   },
 
-  list: () => makeRequest('/api/bulk/', { method: 'GET' }),
+  // Validation report for a CSV without creating a job.
+  validate: async (templateId: string, file: File) => {
+    const session = await getSession();
+    const token = session?.access_token;
+
+    const formData = new FormData();
+    formData.append('file', file);
+
+    const response = await fetch(
+      `${API_URL}/api/bulk/validate?template_id=${templateId}`,
+      {
+        method: 'POST',
+        headers: {
+          Authorization: `Bearer ${token || ''}`,
+        },
+        body: formData,
+      }
+    );
+
+    if (!response.ok) {
+      throw new Error('Failed to validate CSV');
+    }
+
+    return response.json();
+  },
+
+  list: (cursor?: string, limit?: number) =>
+    makeRequest(`/api/bulk/?${listQuery(cursor, limit)}`, { method: 'GET' }),
 
   get: (jobId: string) =>
     makeRequest(`/api/bulk/${jobId}`),
@@ -195,6 +247,54 @@ export const bulkApi = {
   getStatus: (jobId: string) =>
     makeRequest(`/api/bulk/${jobId}`),
 
+  getResults: (jobId: string, after = 0, limit = 100) =>
+    makeRequest(`/api/bulk/${jobId}/results?after=${after}&limit=${limit}`),
+
+  getErrors: (jobId: string, after = 0, limit = 100) =>
+    makeRequest(`/api/bulk/${jobId}/errors?after=${after}&limit=${limit}`),
+
+  // Reads the job's Server-Sent Events stream until the job finishes or
+  // `signal` aborts. fetch is used instead of EventSource so the bearer
+  // token can be sent.
+  streamEvents: async (jobId: string, onEvent: (event: any) => void, signal?: AbortSignal) => {
+    const session = await getSession();
+    const token = session?.access_token;
+
+    const response = await fetch(`${API_URL}/api/bulk/${jobId}/events`, {
+      headers: {
+        Authorization: `Bearer ${token || ''}`,
+        Accept: 'text/event-stream',
+      },
+      signal,
+    });
+
+    if (!response.ok || !response.body) {
+      throw new Error(`Failed to stream job events (HTTP ${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const data = buffer
+          .slice(0, boundary)
+          .split('\n')
+          .filter((line) => line.startsWith('data: '))
+          .map((line) => line.slice(6))
+          .join('\n');
+        buffer = buffer.slice(boundary + 2);
+        if (data) onEvent(JSON.parse(data));
+        boundary = buffer.indexOf('\n\n');
+      }
+    }
+  },
+
   delete: (jobId: string) =>
     makeRequest(`/api/bulk/${jobId}`, { method: 'DELETE' }),
 };
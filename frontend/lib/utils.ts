@@ -93,6 +93,8 @@ export const getJobStatusColor = (status: string) => {
       return 'bg-yellow-100 text-yellow-800';
     case 'processing':
       return 'bg-blue-100 text-blue-800';
+    case 'retrying':
+      return 'bg-orange-100 text-orange-800';
     case 'queued':
       return 'bg-gray-100 text-gray-800';
     case 'failed':
@@ -30,6 +30,9 @@ CREATE TABLE IF NOT EXISTS pages (
     slug VARCHAR(255) NOT NULL,
     html_content TEXT NOT NULL,
     storage_url VARCHAR(500) NOT NULL,
+    search_text TEXT,
+    variables JSONB,
+    render_hash VARCHAR(64),
     word_count INTEGER DEFAULT 0,
     seo_score INTEGER DEFAULT 0,
     seo_data JSONB DEFAULT '{}',
@@ -43,28 +46,171 @@ CREATE TABLE IF NOT EXISTS bulk_jobs (
     id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
     user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
     template_id UUID REFERENCES templates(id) ON DELETE SET NULL,
+    kind VARCHAR(20) NOT NULL DEFAULT 'generate',
     csv_filename VARCHAR(255),
     total_rows INTEGER DEFAULT 0,
     processed_rows INTEGER DEFAULT 0,
     failed_rows INTEGER DEFAULT 0,
     status VARCHAR(50) DEFAULT 'queued',
-    result_urls JSONB DEFAULT '[]',
-    errors JSONB DEFAULT '[]',
+    zip_url VARCHAR(500),
+    zip_parts JSONB,
+    error TEXT,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Databases created before per-row results moved to bulk_job_results.
+ALTER TABLE bulk_jobs ADD COLUMN IF NOT EXISTS zip_url VARCHAR(500);
+ALTER TABLE bulk_jobs ADD COLUMN IF NOT EXISTS zip_parts JSONB;
+ALTER TABLE bulk_jobs ADD COLUMN IF NOT EXISTS error TEXT;
+
+-- Databases created before pages could be regenerated after a template edit.
+ALTER TABLE pages ADD COLUMN IF NOT EXISTS variables JSONB;
+ALTER TABLE pages ADD COLUMN IF NOT EXISTS render_hash VARCHAR(64);
+ALTER TABLE bulk_jobs ADD COLUMN IF NOT EXISTS kind VARCHAR(20) NOT NULL DEFAULT 'generate';
+
+-- Full-text search over pages (see backend/app/services/page_search.py).
+-- search_text is extracted from the HTML in Python, so pages that existed
+-- before this column are indexed by their title, description and slug only
+-- until it is filled. After applying this, run once from backend/:
+--   python backfill_search_text.py
+-- It updates pages whose search_text is NULL in batches and can be re-run.
+ALTER TABLE pages ADD COLUMN IF NOT EXISTS search_text TEXT;
+ALTER TABLE pages ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(meta_description, '')), 'B')
+    || setweight(to_tsvector('english', replace(coalesce(slug, ''), '-', ' ')), 'B')
+    || setweight(to_tsvector('english', coalesce(search_text, '')), 'C')
+) STORED;
+
+CREATE TABLE IF NOT EXISTS bulk_job_results (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    job_id UUID NOT NULL REFERENCES bulk_jobs(id) ON DELETE CASCADE,
+    row_number INTEGER NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    page_id UUID,
+    url VARCHAR(500),
+    title VARCHAR(255),
+    slug VARCHAR(255),
+    seo_score INTEGER,
+    error TEXT,
+    data JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT uq_bulk_job_result_row UNIQUE (job_id, row_number)
+);
+
+-- Databases created before per-row results moved to bulk_job_results: copy
+-- bulk_jobs.result_urls/errors into it, then drop the JSON columns.
+-- Row errors carry their CSV row number (failed shards a "rows" range) and
+-- keep it. Pages were listed in row order without a number; every row gave
+-- either a page or an error, so pages take the rows left free, in order.
+-- Errors from the old single-process worker stored the row's data instead of
+-- its number and take the rows still free after that.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'bulk_jobs' AND column_name = 'result_urls'
+    ) THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO bulk_job_results (job_id, row_number, status, error, data)
+    SELECT j.id, (e->>'row')::int, 'failed', e->>'error', e->'data'
+    FROM bulk_jobs j, jsonb_array_elements(coalesce(j.errors, '[]'::jsonb)) e
+    WHERE jsonb_typeof(e->'row') = 'number'
+    ON CONFLICT (job_id, row_number) DO NOTHING;
+
+    INSERT INTO bulk_job_results (job_id, row_number, status, error, data)
+    SELECT j.id, split_part(e->>'rows', '-', 1)::int, 'failed', e->>'error', jsonb_build_object('rows', e->>'rows')
+    FROM bulk_jobs j, jsonb_array_elements(coalesce(j.errors, '[]'::jsonb)) e
+    WHERE e->>'rows' ~ '^[0-9]+-[0-9]+$'
+    ON CONFLICT (job_id, row_number) DO NOTHING;
+
+    UPDATE bulk_jobs j SET error = (
+        SELECT e->>'error' FROM jsonb_array_elements(j.errors) e
+        WHERE NOT e ? 'row' AND NOT e ? 'rows' LIMIT 1
+    )
+    WHERE j.error IS NULL AND jsonb_typeof(j.errors) = 'array';
+
+    UPDATE bulk_jobs j SET zip_url = (
+        SELECT p->>'url' FROM jsonb_array_elements(j.result_urls) p WHERE p->>'type' = 'zip' LIMIT 1
+    )
+    WHERE j.zip_url IS NULL AND jsonb_typeof(j.result_urls) = 'array';
+
+    CREATE TEMP TABLE bulk_job_free_rows ON COMMIT DROP AS
+    SELECT j.id AS job_id, r AS row_number
+    FROM bulk_jobs j, generate_series(
+        1,
+        greatest(
+            coalesce(j.total_rows, 0),
+            jsonb_array_length(coalesce(j.result_urls, '[]'::jsonb)) + jsonb_array_length(coalesce(j.errors, '[]'::jsonb))
+        )
+    ) r
+    WHERE NOT EXISTS (
+        SELECT 1 FROM bulk_job_results b
+        WHERE b.job_id = j.id AND (
+            b.row_number = r
+            OR (
+                b.data->>'rows' ~ '^[0-9]+-[0-9]+$'
+                AND r BETWEEN split_part(b.data->>'rows', '-', 1)::int AND split_part(b.data->>'rows', '-', 2)::int
+            )
+        )
+    );
+
+    WITH free AS (
+        SELECT job_id, row_number, row_number() OVER (PARTITION BY job_id ORDER BY row_number) AS n
+        FROM bulk_job_free_rows
+    ), pages AS (
+        SELECT j.id AS job_id, p, row_number() OVER (PARTITION BY j.id ORDER BY ord) AS n
+        FROM bulk_jobs j, jsonb_array_elements(coalesce(j.result_urls, '[]'::jsonb)) WITH ORDINALITY AS x(p, ord)
+        WHERE p ? 'page_id'
+    )
+    INSERT INTO bulk_job_results (job_id, row_number, status, page_id, url, title, slug, seo_score)
+    SELECT pages.job_id, free.row_number, 'completed', (p->>'page_id')::uuid, p->>'url', p->>'title',
+           p->>'slug', (p->>'seo_score')::int
+    FROM pages JOIN free ON free.job_id = pages.job_id AND free.n = pages.n
+    ON CONFLICT (job_id, row_number) DO NOTHING;
+
+    DELETE FROM bulk_job_free_rows f
+    USING bulk_job_results b
+    WHERE b.job_id = f.job_id AND b.row_number = f.row_number;
+
+    WITH free AS (
+        SELECT job_id, row_number, row_number() OVER (PARTITION BY job_id ORDER BY row_number) AS n
+        FROM bulk_job_free_rows
+    ), errors AS (
+        SELECT j.id AS job_id, e, row_number() OVER (PARTITION BY j.id ORDER BY ord) AS n
+        FROM bulk_jobs j, jsonb_array_elements(coalesce(j.errors, '[]'::jsonb)) WITH ORDINALITY AS x(e, ord)
+        WHERE jsonb_typeof(e->'row') = 'object'
+    )
+    INSERT INTO bulk_job_results (job_id, row_number, status, error, data)
+    SELECT errors.job_id, free.row_number, 'failed', e->>'error', e->'row'
+    FROM errors JOIN free ON free.job_id = errors.job_id AND free.n = errors.n
+    ON CONFLICT (job_id, row_number) DO NOTHING;
+
+    ALTER TABLE bulk_jobs DROP COLUMN result_urls;
+    ALTER TABLE bulk_jobs DROP COLUMN IF EXISTS errors;
+END $$;
+
 CREATE INDEX IF NOT EXISTS idx_templates_user_id ON templates(user_id);
+CREATE INDEX IF NOT EXISTS idx_templates_user_created ON templates(user_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_pages_user_id ON pages(user_id);
+CREATE INDEX IF NOT EXISTS idx_pages_user_created ON pages(user_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_pages_slug ON pages(slug);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_pages_user_slug ON pages(user_id, slug);
+CREATE INDEX IF NOT EXISTS idx_pages_template_id ON pages(template_id, id);
+CREATE INDEX IF NOT EXISTS idx_pages_search_vector ON pages USING GIN (search_vector);
 CREATE INDEX IF NOT EXISTS idx_bulk_jobs_user_id ON bulk_jobs(user_id);
+CREATE INDEX IF NOT EXISTS idx_bulk_jobs_user_created ON bulk_jobs(user_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_bulk_jobs_status ON bulk_jobs(status);
+CREATE INDEX IF NOT EXISTS idx_bulk_job_results_job_status_row ON bulk_job_results(job_id, status, row_number);
 
 ALTER TABLE templates ENABLE ROW LEVEL SECURITY;
 ALTER TABLE template_variables ENABLE ROW LEVEL SECURITY;
 ALTER TABLE pages ENABLE ROW LEVEL SECURITY;
 ALTER TABLE bulk_jobs ENABLE ROW LEVEL SECURITY;
+ALTER TABLE bulk_job_results ENABLE ROW LEVEL SECURITY;
 
 DO $$
 BEGIN
@@ -116,10 +262,33 @@ BEGIN
     END IF;
 END$$;
 
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_policies WHERE policyname = 'Users can access their bulk job results'
+    ) THEN
+        CREATE POLICY "Users can access their bulk job results"
+            ON bulk_job_results FOR ALL
+            USING (
+                EXISTS (
+                    SELECT 1 FROM bulk_jobs
+                    WHERE bulk_jobs.id = bulk_job_results.job_id
+                    AND bulk_jobs.user_id = auth.uid()
+                )
+            );
+    END IF;
+END$$;
+
 INSERT INTO storage.buckets (id, name, public)
 VALUES ('generated-pages', 'generated-pages', true)
 ON CONFLICT (id) DO NOTHING;
 
+-- Uploaded CSVs: private, with no policies, so only the service key used by
+-- the API and workers can read or write them.
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('bulk-uploads', 'bulk-uploads', false)
+ON CONFLICT (id) DO NOTHING;
+
 DO $$
 BEGIN
     IF NOT EXISTS (
@@ -4,3 +4,6 @@ from pathlib import Path
 backend_path = Path(__file__).resolve().parents[1] / "backend"
 if str(backend_path) not in sys.path:
     sys.path.append(str(backend_path))
+# The backend's job modules import ``worker.redis_conn``; resolve submodules
+# missing here from backend/worker.
+__path__.append(str(backend_path / "worker"))
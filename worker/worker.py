@@ -2,20 +2,25 @@ import sys
 from pathlib import Path
 
 from redis import Redis
-from rq import Worker, Queue
 
 backend_path = Path(__file__).resolve().parents[1] / "backend"
 if str(backend_path) not in sys.path:
     sys.path.append(str(backend_path))
 
 from app.config import settings  # noqa: E402
+from app.services.job_queue import FairShareWorker, lane_queues  # noqa: E402
+from app.services.worker_pool import WorkerPool  # noqa: E402
 
 
 def main():
+    if settings.worker_mode == "warm":
+        WorkerPool(settings.worker_processes, settings.redis_url, preload=("worker.jobs",)).run()
+        return
+
     redis_conn = Redis.from_url(settings.redis_url)
-    queues = [Queue("bulk", connection=redis_conn)]
-    worker = Worker(queues)
-    worker.work(with_scheduler=False)
+    worker = FairShareWorker(lane_queues(redis_conn), connection=redis_conn)
+    # The scheduler puts jobs deferred by the tenant fair share back on their lane.
+    worker.work(with_scheduler=True)
 
 
 if __name__ == "__main__":